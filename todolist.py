@@ -1,27 +1,69 @@
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 from calendar import monthrange
 import os
 import json
 import shutil
 import time
 import re
+import sys
+import asyncio
+import zlib
+import lzma
+import struct
+import sqlite3
+import heapq
+import itertools
+import signal
+import shlex
+import subprocess
+import socket
+import select
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:     # optional, see ItemStatus
+    np = None
+try:
+    import fcntl
+except ImportError:     # not on Windows, see SaveLock
+    fcntl = None
 
 DATE_FORMAT = "%a %d %b"    # e.g. Sat 08 Oct
 SAVE_FILE_DATE_FORMAT = "%d/%m/%Y"
+SAVE_SCHEMA_VERSION = 2     # see SaveSchema
 TO_DO_ITEMS_SAVE_FILE = "todolist_save.json" #os.path.dirname(os.path.abspath(__file__)) + "/todolist_save.json"
+TO_DO_ITEMS_SAVE_DIR = "todolist_shards"     # used instead of TO_DO_ITEMS_SAVE_FILE if SAVE_LAYOUT is "sharded"
+TO_DO_ITEMS_BINARY_FILE = "todolist_save.bin"  # used instead of TO_DO_ITEMS_SAVE_FILE if SAVE_LAYOUT is "binary"
+SAVE_LAYOUT = "file"        # "file", "sharded" or "binary"
+SAVE_LAYOUTS = ("file", "sharded", "binary")
+BINARY_COMPRESSION = "zlib"     # "none", "zlib" or "lzma", for the binary layout
+HISTORY_FILE = "todolist_history.db"
+SAVE_LOCK_FILE = "todolist.lock"    # locked while a program reloads, changes or saves the list, see SaveLock
+REMINDER_PID_FILE = "todolist_remind.pid"   # lets whoever saves the list tell a running reminder daemon
 SETTINGS_FILE = os.path.dirname(os.path.abspath(__file__)) + "/todolist_settings.json"
 LANG_FILE = os.path.dirname(os.path.abspath(__file__)) + "/todolist_lang.json"
 INVALID_YEAR = 9999
 
+SERVER_ADDRESS = "127.0.0.1:8765" if os.name == 'nt' else "todolist.sock"    # 'host:port' for TCP, otherwise a Unix socket path
+SERVER_SAVE_DELAY = 1.0     # seconds, writes that arrive within this time are saved together
+
+REMINDER_TIME = "08:00"     # time of day at which reminders for a date go off
+REMINDER_COMMAND = ""       # run with the reminder as its last argument instead of printing it, if set
+REMINDER_POLL_INTERVAL = 60     # seconds, only used where there is no SIGUSR1 (Windows) to check for changes
+
 MAX_BACKUPS = 5
 BACKUP_DIR = os.path.dirname(os.path.abspath(__file__)) + '/backups'
 
+VECTORIZE_MIN_ITEMS = 64    # below this many items ItemStatus does not bother with NumPy
+
 COLUMN_LENGTHS = (3, 49, 25, 25, 12)
 PADDING = 3
 
 SHOW_N_HIDDEN = False
 NEVER_HIDE = False
 HIDE_RECURRING_ITEMS_BEFORE_RELEVANT = True
+VIEWPORT_MODE = False
 
 HELP_STRING = """Commands:
  - Basic:
@@ -37,14 +79,32 @@ HELP_STRING = """Commands:
     > 'unhide [ID]'             Unhide a hidden item
     > 'delay [ID] [n]'          Delay showing an item for n days without changing any properties of the item
     > 'undelay [ID]'            Remove any delay on an item
+    > 'done -r [ID]'            Mark an item and everything in its sublists as done
+    > 'hide -r [ID]'            Hide an item and everything in its sublists
+    > 'delay -r [ID] [n]'       Delay an item and everything in its sublists
+    > 'move [ID] [path]'        Move an item and its sublist to another list, e.g. 'move 4 3.2' puts it in the
+                                sublist of item 2 in the sublist of item 3 ('move 4 home' for the base list)
  - Sublists
     > 'sub [ID]' or 's [ID]'    Show sublist for an item
     > 'sub'                     Close the current sublist (move up in tree), subitems are saved
     > 'home'                    Go back to the base list - i.e. close all sublists
+    > IDs can also be paths from the base list to reach items in sublists directly, e.g. 'done 3.2.1',
+      'delay 5.1 2' or 'edit 7.4' (works with done, finish, edit, del, hide, unhide, delay, undelay, move and stats)
  - Recurring items
     > 'finish [ID]'             Mark a recurring item as finished, in effect deleting it
     > 'revert [ID]'             Roll a recurring item back to the previous due date (undo mark as done)
     > 'show'                    Show all hidden items (since recurring items with far off due dates are hidden)
+    > 'summary'                 Show how many items are overdue, due today, hidden, etc. in all lists
+ - History
+    > 'history'                 Show what was completed in the last week
+    > 'history [n]'             Show what was completed in the last n days
+    > 'history [date] [date]'   Show what was completed on a date or between two dates
+    > 'stats [ID]'              Show how often and how regularly an item has been completed
+ - Viewport (only show as many items as fit in the terminal)
+    > 'page'                    Turn viewport mode on or off
+    > 'page [n]'                Go to page n (turns viewport mode on)
+    > 'next' or 'prev'          Go to the next or previous page
+    > 'goto [ID]'               Go to the page containing an item
  - Meta     
     > 'del [ID]'                Remove an item
       'remove [ID]'     
@@ -58,6 +118,11 @@ HELP_STRING = """Commands:
     > 'lang'                    Show possible languages
     > 'restore_backup'          Restore the most recent backups. Five recent backups can be found in the 'backups' folder
 
+Run 'todolist.py --serve [address]' to serve the list to other programs instead (see todolist_client.py).
+Run 'todolist.py --remind' to be reminded when items become due, e.g. in the background or at startup.
+Run 'todolist.py --convert sharded' to save big lists as one file per top-level item ('--convert file' to go back).
+Run 'todolist.py --convert binary' to save the list in a compact binary file ('--convert file' exports it as JSON again).
+
 For dates you can use:
  - Day of the week          'saturday'  'sat'
  - Today                    'today'     'tod'
@@ -134,6 +199,14 @@ class TextFormatting:
             out = out[:-1]
         return out
 
+    @staticmethod
+    def get_num_rows(items: list[str], collengths: tuple[int]) -> int:
+        # number of lines columnize() would produce for these items
+        num_rows = 1
+        for item, collength in zip(items, collengths):
+            num_rows = max(num_rows, -(-len(item) // collength))
+        return num_rows
+
 class Recurrence:
     WEEKLY = 2      # \
     MONTHLY = 1     #  |- ordering of numbers is important! do not change!
@@ -146,6 +219,15 @@ class Recurrence:
         DAILY : timedelta(days=1)
     }
 
+    # language independent names used in the save file
+    to_key = {
+        WEEKLY : "weekly",
+        MONTHLY : "monthly",
+        DAILY : "daily",
+        None : "None"
+    }
+    from_key = {key : rec for rec, key in to_key.items()}
+
     @staticmethod
     def from_text(rec_in: str):
         if rec_in == Communication["weekly"] : return Recurrence.WEEKLY
@@ -153,6 +235,15 @@ class Recurrence:
         if rec_in == Communication["daily"] : return Recurrence.DAILY
         return None
 
+    @staticmethod
+    def from_value(rec_in):
+        # accepts a Recurrence value, its text or None
+        if rec_in in (Recurrence.WEEKLY, Recurrence.MONTHLY, Recurrence.DAILY):
+            return rec_in
+        if isinstance(rec_in, str):
+            return Recurrence.from_text(rec_in)
+        return None
+
     @staticmethod
     def get_valid():
         return Communication["weekly"], Communication["monthly"], Communication["daily"], "None", ""
@@ -236,6 +327,42 @@ class DateHandler:
 
         return date(INVALID_YEAR, 1, 1)
 
+    # the save file format, SAVE_FILE_DATE_FORMAT, without going through strftime/strptime
+    @staticmethod
+    def to_save_string(date_in: date) -> str:
+        return f"{date_in.day:02d}/{date_in.month:02d}/{date_in.year}"
+
+    @staticmethod
+    def from_save_string(string_in: str) -> date:
+        day, month, year = string_in.split("/")
+        return date(int(year), int(month), int(day))
+
+    @staticmethod
+    def get_past_date_from_string(string_in: str) -> date:
+        # like get_date_from_string() but looking back, e.g. '12/10' is the last 12 October rather than the next one
+        result = DateHandler.get_date_from_string(string_in)
+        if result.year == INVALID_YEAR or result <= date.today():
+            return result
+
+        if string_in.lower() in DateHandler.weekdays.keys():
+            return result - timedelta(weeks=1)
+        if len(string_in.split("/")) == 2:
+            try:
+                return result.replace(year=result.year-1)
+            except ValueError:  # 29 February
+                return result.replace(year=result.year-1, day=28)
+        return result
+
+    @staticmethod
+    def get_date(value: date | str | None) -> date:
+        if isinstance(value, date):
+            return value
+        if value is None:
+            return date(INVALID_YEAR, 1, 1)
+        if re.fullmatch(r"\d{4}-\d{2}-\d{2}", value):     # ISO format, as used by the server
+            return date.fromisoformat(value)
+        return DateHandler.get_date_from_string(value)
+
 class ToDoListItem:
     def __init__(self, id: str) -> None:
         self.id: str = id
@@ -247,6 +374,11 @@ class ToDoListItem:
         self.hide_before_relevant = False
         
         self._sublist: ToDoList = ToDoList({})
+        self._sublist.owner_item = self
+
+        self._owner: ToDoList = None        # the list this item is in
+        self._status: tuple[int] = None     # this item's part of the owner's aggregates, see ToDoList.AGGREGATES
+        self._num_lines: tuple = None       # (what it depends on, number of lines) cached by get_num_lines()
 
         self.own_do_date: date = None
         self.own_due_date: date = None
@@ -261,44 +393,48 @@ class ToDoListItem:
     def populate(
             self,
             description: str,
-            do_date_str: str,
-            due_date_str: str,
-            recurrence_str: str,
+            do_date: date,
+            due_date: date,
+            recurrence: int,
             delay_to_date: date,
             hide_before_relevant: bool,
-            sublist: dict
+            sublist: "dict | ToDoList"
         ):
         self.description = description
-        self.own_do_date = DateHandler.get_date_from_string(do_date_str)
-        self.own_due_date = DateHandler.get_date_from_string(due_date_str)
-        self.own_recurrence = Recurrence.from_text(recurrence_str)
+        self.own_do_date = do_date
+        self.own_due_date = due_date
+        self.own_recurrence = recurrence
 
         self.do_date = self.own_do_date
         self.due_date = self.own_due_date
         self.recurrence = self.own_recurrence
 
         self.hide_before_relevant = hide_before_relevant
-        self.delay_to(DateHandler.get_date_from_string(delay_to_date))
-        self._sublist = ToDoList(sublist)
+        self.delay_to(delay_to_date)
+        self._sublist = sublist if isinstance(sublist, ToDoList) else ToDoList(sublist)
+        self._sublist.owner_item = self
         
         self.update_inherited_data()
 
-    def edit(self, being_created = False, desc=None):
+    @staticmethod
+    def prompt_fields(being_created = False, desc=None) -> dict:
+        # ask the user for the fields of an item, the result can be passed to set_fields()
+        fields = {}
         if being_created:
             if desc is None:
                 print(Communication["Description: "], end=" ")
-                self.description = input()
+                fields["description"] = input()
             else:
-                self.description = desc
+                fields["description"] = desc
             print(Communication["Do date:     "], end=" ")
-            self.own_do_date = DateHandler.get_date_from_string(input())
+            fields["do_date"] = input()
             print(Communication["Due date:     "], end=" ")
-            self.own_due_date = DateHandler.get_date_from_string(input())
+            fields["due_date"] = input()
             while True:
                 print(Communication["Recurrence:  "], end=" ")
                 rec_in = input().strip()
                 if rec_in in Recurrence.get_valid():
-                    self.own_recurrence = Recurrence.from_text(rec_in)
+                    fields["recurrence"] = rec_in
                     break
                 else:
                     print(Communication["Invalid recurrence. Valid:"], *Recurrence.get_valid())
@@ -306,13 +442,16 @@ class ToDoListItem:
         else:
             print(Communication["Description: "], end=" ")
             str_in = input()
-            self.description = str_in if str_in != "" else self.description
+            if str_in != "":
+                fields["description"] = str_in
             print(Communication["Do date:     "], end=" ")
             str_in = input()
-            self.own_do_date = DateHandler.get_date_from_string(str_in) if str_in != "" else self.own_do_date
+            if str_in != "":
+                fields["do_date"] = str_in
             print(Communication["Due date:     "], end=" ")
             str_in = input()
-            self.own_due_date = DateHandler.get_date_from_string(str_in) if str_in != "" else self.own_due_date
+            if str_in != "":
+                fields["due_date"] = str_in
 
             while True:
                 print(Communication["Recurrence:  "], end=" ")
@@ -320,14 +459,38 @@ class ToDoListItem:
                 if rec_in == "":
                     break
                 if rec_in in Recurrence.get_valid():
-                    self.own_recurrence = Recurrence.from_text(rec_in)
+                    fields["recurrence"] = rec_in
                     break
                 else:
                     print(Communication["Invalid recurrence. Valid:"], *Recurrence.get_valid())
 
-        self.update_inherited_data()
+        return fields
 
-    def to_string(self, generation=0, in_hierarchy=False):
+    def edit(self, being_created = False, desc=None):
+        self.set_fields(ToDoListItem.prompt_fields(being_created, desc))
+
+    # only the fields present are changed; dates can be date objects or strings (see DateHandler),
+    # recurrence can be a Recurrence value, its text or None
+    def set_fields(self, fields: dict, update_inherited_data=True):
+        if "description" in fields:
+            self.description = fields["description"]
+        if "do_date" in fields:
+            self.own_do_date = DateHandler.get_date(fields["do_date"])
+        if "due_date" in fields:
+            self.own_due_date = DateHandler.get_date(fields["due_date"])
+        if "recurrence" in fields:
+            self.own_recurrence = Recurrence.from_value(fields["recurrence"])
+        if "hide_before_relevant" in fields:
+            self.hide_before_relevant = fields["hide_before_relevant"]
+        if "delay_to_date" in fields:
+            self.delay_to(DateHandler.get_date(fields["delay_to_date"]))
+
+        if update_inherited_data:
+            self.update_inherited_data()
+        else:
+            self.refresh_status()
+
+    def get_columns(self, generation=0, in_hierarchy=False) -> list[str]:
         connective = " -- "
 
         id_string = self.id if not in_hierarchy else ""
@@ -389,25 +552,67 @@ class ToDoListItem:
 
         columns.append(recurrence_string)
 
-        out = TextFormatting.columnize(columns, COLUMN_LENGTHS, PADDING, end_newline=False)
+        return columns
+
+    def get_num_unhidden_subitems(self) -> int:
+        if not self.sublist.items:
+            return 0
+        return len(self.sublist.items) - self.sublist.get_num_hidden_items()
+
+    def to_string(self, generation=0, in_hierarchy=False):
+        out = TextFormatting.columnize(self.get_columns(generation, in_hierarchy), COLUMN_LENGTHS, PADDING, end_newline=False)
         if not in_hierarchy:
             out += "\n"
-            if self.sublist.items:
-                num_unhidden_subitems = len(self.sublist.items) - self.sublist.get_num_hidden_items()
-                if num_unhidden_subitems > 0:
-                    prefix = "   "*generation + "->"
-                    out += TextFormatting.columnize(["","   "*generation + f"-> ... ({num_unhidden_subitems})","","",""], COLUMN_LENGTHS, PADDING, end_newline=True)
+            num_unhidden_subitems = self.get_num_unhidden_subitems()
+            if num_unhidden_subitems > 0:
+                out += TextFormatting.columnize(["","   "*generation + f"-> ... ({num_unhidden_subitems})","","",""], COLUMN_LENGTHS, PADDING, end_newline=True)
         return out
 
+    # number of terminal lines print(self.to_string(generation)) takes up, without building the string.
+    # Cached with the values the columns are made from, so it is only worked out again once one of them changes
+    # or something in the sublist does (see ToDoList._apply_delta()). This way print() can work out the pages
+    # without formatting the rows that are not shown.
+    def get_num_lines(self, generation=0) -> int:
+        key = (
+            generation, self.id, self.description, self.do_date, self.due_date, self.recurrence,
+            self.own_do_date, self.own_due_date, self.own_recurrence, date.today(), Communication
+        )
+        if self._num_lines is None or self._num_lines[0] != key:
+            num_lines = TextFormatting.get_num_rows(self.get_columns(generation), COLUMN_LENGTHS)
+            num_lines += 1      # print() adds an empty line after the item
+            if self.get_num_unhidden_subitems() > 0:
+                num_lines += 1
+            self._num_lines = (key, num_lines)
+        return self._num_lines[1]
+
     @property
     def delay_to_date(self):
         return self._delay_to_date
     
     def delay_to(self, delay_to_date: date):
         self._delay_to_date = delay_to_date
+        self.refresh_status()
 
     def undelay(self):
         self._delay_to_date = date.today()
+        self.refresh_status()
+
+    # counts towards ToDoList.AGGREGATES for this item alone, based on its own dates (hidden uses the inherited ones like get_hidden())
+    def get_status(self, today: date) -> tuple[int]:
+        return (
+            1,
+            self.own_due_date < today,
+            self.own_do_date == today or self.own_due_date == today,
+            self.get_hidden(),
+            self.delay_to_date > today,
+            self.own_recurrence is not None,
+            self.own_do_date <= today or self.own_due_date <= today,
+        )
+
+    # tell the list this item is in that it has changed, so its aggregates stay up to date
+    def refresh_status(self):
+        if self._owner is not None:
+            self._owner.refresh_item(self)
 
     # update do_date, due_date and recurrence based on subitems
     def update_inherited_data(self):
@@ -427,6 +632,8 @@ class ToDoListItem:
         if self.recurrence == Recurrence.min:
             self.recurrence = None
 
+        self.refresh_status()
+
     def get_hidden(self):
         delay_me = self.delay_to_date > date.today()
 
@@ -442,10 +649,20 @@ class ToDoListItem:
         return True
 
 class ToDoList:
+    # Counts over all items in the list and its sublists, kept up to date as items change. "today_or_before"
+    # counts items with a do or due date of today or earlier, i.e. whether there is anything to do today.
+    AGGREGATES = ("total", "overdue", "today", "hidden", "delayed", "recurring", "today_or_before")
+
     def __init__(self, save_dict: dict):
         self.items : list[ToDoListItem] = []
-        self.ids_in_use = []
+        self.ids_in_use: set[str] = set()
+        self._items_by_id: dict[str, ToDoListItem] = {}     # kept up to date by _attach() and _detach()
         self.last_removed: ToDoListItem = None
+        self.last_completed: list[tuple[ToDoListItem, date]] = []     # items completed by the last complete_many() and the occurrence that was done
+
+        self.owner_item: ToDoListItem = None    # the item this is the sublist of, if any
+        self._aggregates: list[int] = [0]*len(ToDoList.AGGREGATES)
+        self._aggregates_day: date = date.today()
 
         self.show_all = False
 
@@ -464,49 +681,44 @@ class ToDoList:
             print(self.log_string)
             self.log_string = None
 
+    # save_dict must be in the current save schema, see SaveSchema
     def populate(self, save_dict: dict):
-        self.ids_in_use = []
+        self.ids_in_use = set()
         for item_id, item_info in save_dict.items():
             to_do_item = ToDoListItem(item_id)
-
-            if item_info["do_date"] == "None":
-                item_info["do_date"] = None
-            if item_info["due_date"] == "None":
-                item_info["due_date"] = None
-
-            try:
-                if item_info["delay_to_date"] == "None":        # TODO remove this
-                    item_info["delay_to_date"] = date.today().strftime(SAVE_FILE_DATE_FORMAT)
-            except KeyError:
-                item_info["delay_to_date"] = date.today().strftime(SAVE_FILE_DATE_FORMAT)
-
-            hide_before_relevant = False
             try:
-                hide_before_relevant = item_info["hide_before_relevant"]
-            except KeyError:
-                pass
-
-            to_do_item.populate(
-                item_info["description"],
-                item_info["do_date"],
-                item_info["due_date"],
-                item_info["recurrence"],
-                item_info["delay_to_date"],
-                hide_before_relevant,
-                item_info["sublist"]
-            )
-            self.items.append(to_do_item)
-            self.ids_in_use.append(item_id)
+                to_do_item.populate(
+                    item_info["description"],
+                    DateHandler.from_save_string(item_info["do_date"]),
+                    DateHandler.from_save_string(item_info["due_date"]),
+                    Recurrence.from_key[item_info["recurrence"]],
+                    DateHandler.from_save_string(item_info["delay_to_date"]),
+                    item_info["hide_before_relevant"],
+                    item_info["sublist"]
+                )
+            except SaveFileError as e:
+                e.path.insert(0, item_id)
+                raise
+            except (KeyError, ValueError, TypeError, AttributeError) as e:
+                raise SaveFileError.from_exception(e, [item_id]) from e
+
+            self.append_loaded_item(to_do_item)
+
+    # adds an item that was just read from a save file, without sorting
+    def append_loaded_item(self, to_do_item: ToDoListItem):
+        self.items.append(to_do_item)
+        self.ids_in_use.add(to_do_item.id)
+        self._attach(to_do_item)
 
     def get_save_dict(self):
         save_dict = {}
         for to_do_item in self.items:
             save_dict[to_do_item.id] = {
                 "description" : to_do_item.description,
-                "do_date" : to_do_item.own_do_date.strftime(SAVE_FILE_DATE_FORMAT) if to_do_item.own_do_date is not None else "None",
-                "due_date" : to_do_item.own_due_date.strftime(SAVE_FILE_DATE_FORMAT) if to_do_item.own_due_date is not None else "None",
-                "recurrence" : Recurrence.to_text(to_do_item.own_recurrence),
-                "delay_to_date" : to_do_item.delay_to_date.strftime(SAVE_FILE_DATE_FORMAT),
+                "do_date" : DateHandler.to_save_string(to_do_item.own_do_date),
+                "due_date" : DateHandler.to_save_string(to_do_item.own_due_date),
+                "recurrence" : Recurrence.to_key[to_do_item.own_recurrence],
+                "delay_to_date" : DateHandler.to_save_string(to_do_item.delay_to_date),
                 "hide_before_relevant" : to_do_item.hide_before_relevant,
                 "sublist" : to_do_item.sublist.get_save_dict()
             }
@@ -524,74 +736,149 @@ class ToDoList:
         self.items.sort(key= lambda x: min(x.due_date, x.do_date))
 
     def add_item(self, desc=None, id: str=None):
-        if id is not None:
-            if id in self.ids_in_use:
-                self.log("ID in use.")
-            else:
-                to_do_item = ToDoListItem(id)
-                to_do_item.edit(being_created=True, desc=desc)
-
-                self.items.append(to_do_item)
-                self.sort()
-
-                self.ids_in_use.append(to_do_item.id)
-        else:
-            to_do_item = ToDoListItem(self.get_new_id())
-            to_do_item.edit(being_created=True, desc=desc)
-
-            self.items.append(to_do_item)
-            self.sort()
+        if id is not None and id in self.ids_in_use:
+            self.log("ID in use.")
+            return
 
-            self.ids_in_use.append(to_do_item.id)
+        fields = ToDoListItem.prompt_fields(being_created=True, desc=desc)
+        if id is not None:
+            fields["id"] = id
+        self.add_many([fields])
 
     def remove_item(self, id: str):
-        for i in range(len(self.items)):
-            if self.items[i].id == id:
-                self.last_removed = self.items.pop(i)
-                break
-        else:
-            for i in range(len(self.items)):
-                if self.items[i].description == id:
-                    id = self.items[i].id
-                    self.last_removed = self.items.pop(i)
-                    break
-            else:
-                self.log(Communication["Item does not exist."])
-                return
-
-        self.ids_in_use.remove(id)
+        self.remove_many([id])
 
     def undo_remove_item(self):
         if self.last_removed is not None:
-            self.items.append(self.last_removed)
-            self.sort()
-
-            self.ids_in_use.append(self.last_removed.id)
+            self.insert_item(self.last_removed)     # with a new ID if its ID was given to another item since
             self.last_removed = None
 
     def edit_item(self, id: str):
         item = self.get_item(id)
         if item is not None:
-            item.edit()
+            self.update_many({item.id: ToDoListItem.prompt_fields()})
+
+    # Bulk operations: these take structured data instead of prompting and sort the list only once per call.
+    # Items are looked up like get_item(), i.e. by ID and otherwise by description.
+
+    def _get_items(self, ids) -> dict[str, ToDoListItem]:
+        items_by_id = {item.id: item for item in self.items}
+        items_by_description = None
+        found = {}
+        for id in ids:
+            item = items_by_id.get(id)
+            if item is None:
+                if items_by_description is None:
+                    items_by_description = {}
+                    for to_do_item in reversed(self.items):     # so the first match wins, as in get_item()
+                        items_by_description[to_do_item.description] = to_do_item
+                item = items_by_description.get(id)
+
+            if item is None:
+                self.log(Communication["Item does not exist."])
+            else:
+                found[item.id] = item
+        return found
+
+    def _remove_items(self, items: dict[str, ToDoListItem]):
+        if not items:
+            return
+        removing = set(map(id, items.values()))
+        self.last_removed = next(to_do_item for to_do_item in self.items if id(to_do_item) in removing)
+        self._take_items(items)
+
+    def _take_items(self, items: dict[str, ToDoListItem]):
+        removing = set(map(id, items.values()))
+        self.items = [to_do_item for to_do_item in self.items if id(to_do_item) not in removing]
+        self.ids_in_use.difference_update(items)
+        for to_do_item in items.values():
+            self._detach(to_do_item)
+
+    # takes an item out of this list without it counting as removed (so it cannot be undone), e.g. to move it
+    def take_item(self, item: ToDoListItem):
+        self._take_items({item.id: item})
+
+    # puts an item taken from another list in this one, giving it a new ID if its ID is in use here
+    def insert_item(self, item: ToDoListItem):
+        if item.id in self.ids_in_use:
+            item.id = self.get_new_id()
+        self.items.append(item)
+        self.ids_in_use.add(item.id)
+        self._attach(item)
+        self.sort()
+
+    # each entry is a dict of fields as for ToDoListItem.set_fields(), plus an optional "id"; returns the new IDs.
+    # All items are built before any is added, so if one is invalid (e.g. an impossible date) nothing changes.
+    def add_many(self, items: list[dict]) -> list[str]:
+        new_items = []
+        for fields in items:
+            to_do_item = ToDoListItem(fields.get("id"))
+            to_do_item.set_fields({"description": "", "do_date": None, "due_date": None, "recurrence": None, **fields})
+            new_items.append(to_do_item)
+
+        new_ids = []
+        next_id = 1
+        for to_do_item in new_items:
+            if to_do_item.id is None:
+                to_do_item.id = self.get_new_id(next_id)
+                next_id = int(to_do_item.id) + 1
+            elif to_do_item.id in self.ids_in_use:
+                self.log("ID in use.")
+                continue
+
+            self.items.append(to_do_item)
+            self.ids_in_use.add(to_do_item.id)
+            self._attach(to_do_item)
+            new_ids.append(to_do_item.id)
+
+        if new_ids:
             self.sort()
+        return new_ids
+
+    # updates maps item IDs to dicts of fields as for ToDoListItem.set_fields()
+    def update_many(self, updates: dict[str, dict]) -> list[str]:
+        found = self._get_items(updates.keys())
+        for key, fields in updates.items():
+            item = self.find_item(key)     # keys can be descriptions, found is by ID
+            if item is None:
+                continue
+            item.set_fields(fields)
+
+        if found:
+            self.sort()
+        return list(found)
+
+    # recurring items move on to their next occurrence, other items are removed
+    def complete_many(self, ids: list[str]) -> list[str]:
+        found = self._get_items(ids)
+        to_remove = {}
+        self.last_completed = []
+        for id, item in found.items():
+            occurrence = item.own_do_date if item.own_do_date.year != INVALID_YEAR else item.own_due_date
+            self.last_completed.append((item, occurrence if occurrence.year != INVALID_YEAR else None))
 
-    def done_item(self, id: str):
-        item = self.get_item(id)
-        if item is not None:
             if item.own_recurrence is not None:
                 item.own_do_date += Recurrence.to_timedelta[item.own_recurrence]
                 item.own_due_date += Recurrence.to_timedelta[item.own_recurrence]
-                self.sort()
+                item.update_inherited_data()
             else:
-                self.remove_item(id)
+                to_remove[id] = item
 
-    def finish_recurring_item(self, id: str):
-        item = self.get_item(id)
-        if item is not None:
-            if item.own_recurrence is not None:
-                self.remove_item(id)
-            else:
-                self.done_item(id)
+        self._remove_items(to_remove)
+        if len(to_remove) < len(found):
+            self.sort()
+        return list(found)
+
+    def delay_many(self, ids: list[str], n_days: int) -> list[str]:
+        found = self._get_items(ids)
+        for item in found.values():
+            item.delay_to(date.today()+timedelta(days=n_days))
+        return list(found)
+
+    def remove_many(self, ids: list[str]) -> list[str]:
+        found = self._get_items(ids)
+        self._remove_items(found)
+        return list(found)
 
     def revert_recurring_item(self, id: str):
         item = self.get_item(id)
@@ -599,21 +886,28 @@ class ToDoList:
             if item.own_recurrence is not None:
                 item.own_do_date -= Recurrence.to_timedelta[item.own_recurrence]
                 item.own_due_date -= Recurrence.to_timedelta[item.own_recurrence]
+                item.update_inherited_data()
 
     def get_item(self, id: str):
-        for item in self.items:
-            if item.id == id:
-                return item
+        item = self.find_item(id)
+        if item is None:
+            self.log(Communication["Item does not exist."])
+        return item
+
+    # like get_item() but without logging anything if the item does not exist
+    def find_item(self, id: str):
+        item = self._items_by_id.get(id)
+        if item is not None:
+            return item
         else:
             for item in self.items:
                 if item.description == id:
                     return item
             else:
-                self.log(Communication["Item does not exist."])
                 return None
 
-    def get_new_id(self) -> str:
-        n = 1
+    def get_new_id(self, start=1) -> str:
+        n = start
         while True:
             if str(n) not in self.ids_in_use:
                 return str(n)
@@ -623,23 +917,20 @@ class ToDoList:
         self.show_all = True
 
     def remove_all_items(self):
-        for i in range(len(self.items)-1, -1, -1):
-            self.remove_item(self.items[i].id)
+        self.remove_many([to_do_item.id for to_do_item in self.items])
 
     def hide_item(self, id):
         item = self.get_item(id)
         if item is not None:
-            item.hide_before_relevant = True
+            item.set_fields({"hide_before_relevant" : True})
 
     def unhide_item(self, id):
         item = self.get_item(id)
         if item is not None:
-            item.hide_before_relevant = False
+            item.set_fields({"hide_before_relevant" : False})
 
     def delay_item(self, id, n_days: int):
-        item = self.get_item(id)
-        if item is not None:
-            item.delay_to(date.today()+timedelta(days=n_days))
+        self.delay_many([id], n_days)
 
     def undelay_item(self, id):
         item = self.get_item(id)
@@ -649,11 +940,525 @@ class ToDoList:
     def get_num_hidden_items(self):
         if NEVER_HIDE:
             return 0
-        num_hidden_items = 0
+        return sum(ItemStatus(self.items).get_flags()["hidden"])
+
+    # Aggregates: each item's status is counted in its own list and every list above it. Changes are passed up
+    # as deltas, and everything is recounted once the day changes since most of the counts depend on the date.
+
+    def get_aggregates(self) -> dict[str, int]:
+        if self._aggregates_day != date.today():
+            self.recount_aggregates()
+        return dict(zip(ToDoList.AGGREGATES, self._aggregates))
+
+    def recount_aggregates(self) -> None:
+        today = date.today()
+        aggregates = [0]*len(ToDoList.AGGREGATES)
         for to_do_item in self.items:
-            if to_do_item.get_hidden():
-                num_hidden_items += 1
-        return num_hidden_items
+            to_do_item.sublist.recount_aggregates()
+            to_do_item._status = to_do_item.get_status(today)
+            for i, count in enumerate(to_do_item._status):
+                aggregates[i] += count
+            for i, count in enumerate(to_do_item.sublist._aggregates):
+                aggregates[i] += count
+        self._aggregates = aggregates
+        self._aggregates_day = today
+
+    def _apply_delta(self, delta: list[int]) -> None:
+        to_do_list = self
+        while to_do_list is not None:
+            for i, change in enumerate(delta):
+                to_do_list._aggregates[i] += change
+            if to_do_list.owner_item is not None:
+                to_do_list.owner_item._num_lines = None     # its subitems changed
+            to_do_list = to_do_list.owner_item._owner if to_do_list.owner_item is not None else None
+
+    def _attach(self, item: ToDoListItem) -> None:
+        item._owner = self
+        self._items_by_id[item.id] = item
+        item._status = item.get_status(date.today())
+        self._apply_delta([own + sub for own, sub in zip(item._status, item.sublist._aggregates)])
+
+    def _detach(self, item: ToDoListItem) -> None:
+        self._apply_delta([-(own + sub) for own, sub in zip(item._status, item.sublist._aggregates)])
+        item._owner = None
+        del self._items_by_id[item.id]
+
+    def refresh_item(self, item: ToDoListItem) -> None:
+        status = item.get_status(date.today())
+        if status != item._status:
+            self._apply_delta([new - old for new, old in zip(status, item._status)])
+            item._status = status
+
+
+class ItemStatus:
+    # Columnar view of a number of items (do/due/delay dates as ordinals, recurrence codes and hide flags) so the
+    # status of all of them can be worked out in one pass. Uses NumPy when it is installed and there are enough
+    # items to make it worthwhile, plain Python otherwise; both give the same results.
+    FLAGS = ("passed", "overdue", "today", "tomorrow", "hidden")
+
+    def __init__(self, items: list[ToDoListItem]) -> None:
+        self.items = items
+        self.do = [item.do_date.toordinal() for item in items]
+        self.due = [item.due_date.toordinal() for item in items]
+        self.delay = [item.delay_to_date.toordinal() for item in items]
+        self.recurrence = [item.recurrence if item.recurrence is not None else 0 for item in items]
+        self.hide = [item.hide_before_relevant for item in items]
+
+        self.vectorized = np is not None and len(items) >= VECTORIZE_MIN_ITEMS
+        if self.vectorized:
+            self.do = np.array(self.do, dtype=np.int64)
+            self.due = np.array(self.due, dtype=np.int64)
+            self.delay = np.array(self.delay, dtype=np.int64)
+            self.recurrence = np.array(self.recurrence, dtype=np.int8)
+            self.hide = np.array(self.hide, dtype=bool)
+
+    # flag name -> list with a bool for each item, same as the checks in ToDoListItem.to_string() and get_hidden()
+    def get_flags(self, today: date = None) -> dict[str, list[bool]]:
+        today = (today if today is not None else date.today()).toordinal()
+        if self.vectorized:
+            return {name : flags.tolist() for name, flags in self._get_flags_numpy(today).items()}
+        return self._get_flags_python(today)
+
+    def _get_flags_numpy(self, today: int) -> dict:
+        recurring = self.recurrence != 0
+        may_hide = np.where(recurring, HIDE_RECURRING_ITEMS_BEFORE_RELEVANT, self.hide)
+        relevant = (self.do - 2 <= today) | (self.due - 3 <= today)
+        return {
+            "passed" : self.do < today,
+            "overdue" : self.due < today,
+            "today" : (self.do == today) | (self.due == today),
+            "tomorrow" : (self.do == today+1) | (self.due == today+1),
+            "hidden" : (self.delay > today) | (may_hide & ~relevant),
+        }
+
+    def _get_flags_python(self, today: int) -> dict[str, list[bool]]:
+        flags = {name : [] for name in ItemStatus.FLAGS}
+        for do, due, delay, recurrence, hide in zip(self.do, self.due, self.delay, self.recurrence, self.hide):
+            may_hide = HIDE_RECURRING_ITEMS_BEFORE_RELEVANT if recurrence != 0 else hide
+            relevant = do - 2 <= today or due - 3 <= today
+            flags["passed"].append(do < today)
+            flags["overdue"].append(due < today)
+            flags["today"].append(do == today or due == today)
+            flags["tomorrow"].append(do == today+1 or due == today+1)
+            flags["hidden"].append(delay > today or (may_hide and not relevant))
+        return flags
+
+
+class SaveFileError(Exception):
+    # path is the list of IDs leading to the item that could not be read, empty if it is about the whole file
+    def __init__(self, message: str, path: list[str] = None) -> None:
+        super().__init__(message)
+        self.message = message
+        self.path = path if path is not None else []
+
+    @staticmethod
+    def from_exception(e: Exception, path: list[str]) -> "SaveFileError":
+        if isinstance(e, KeyError):
+            return SaveFileError(f"missing {e.args[0]!r}", path)
+        return SaveFileError(f"{type(e).__name__}: {e}", path)
+
+    def __str__(self) -> str:
+        if self.path:
+            return f"item {'.'.join(self.path)}: {self.message}"
+        return self.message
+
+
+class SaveSchema:
+    # Versions of the save file:
+    #   1   the dict of items itself; dates could be "None", delay_to_date and hide_before_relevant could be
+    #       missing, and recurrence was saved in the language in use at the time
+    #   2   {"version" : 2, "items" : {...}} with every field present, dates as SAVE_FILE_DATE_FORMAT and
+    #       recurrence as one of Recurrence.to_key
+    # Older files are migrated once when they are loaded and then saved in the current version, so
+    # ToDoList.populate() only has to handle the current one.
+
+    @staticmethod
+    def get_version(data) -> int:
+        if not isinstance(data, dict):
+            raise SaveFileError("not a JSON object")
+        if isinstance(data.get("version"), int) and isinstance(data.get("items"), dict):
+            return data["version"]
+        return 1
+
+    @staticmethod
+    def wrap(items: dict) -> dict:
+        return {"version" : SAVE_SCHEMA_VERSION, "items" : items}
+
+    # returns the items in the current version and whether they had to be migrated
+    @staticmethod
+    def load(data) -> tuple[dict, bool]:
+        version = SaveSchema.get_version(data)
+        if version > SAVE_SCHEMA_VERSION:
+            raise SaveFileError(f"save file version {version} is newer than this program supports ({SAVE_SCHEMA_VERSION})")
+        if version == SAVE_SCHEMA_VERSION:
+            return data["items"], False
+        if version == 1:
+            return SaveSchema.migrate_v1(data, SaveSchema._get_recurrence_translations()), True
+        raise SaveFileError(f"unknown save file version {version}")
+
+    @staticmethod
+    def _get_recurrence_translations() -> dict[str, str]:
+        # every known translation of the recurrences -> their save file key
+        translations = {Communication[key] : key for key in ("weekly", "monthly", "daily")}
+        try:
+            with open(LANG_FILE, "r", encoding="utf-8") as lang_file:
+                for language in json.load(lang_file).values():
+                    for key in ("weekly", "monthly", "daily"):
+                        if key in language:
+                            translations.setdefault(language[key], key)
+        except (FileNotFoundError, ValueError):
+            pass
+        return translations
+
+    # builds new dicts rather than changing the loaded ones
+    @staticmethod
+    def migrate_v1(items: dict, recurrence_translations: dict[str, str]) -> dict:
+        def migrate_date(date_str, default: date) -> str:
+            if date_str is None or date_str == "None":
+                return DateHandler.to_save_string(default)
+            return DateHandler.to_save_string(DateHandler.get_date_from_string(date_str))
+
+        migrated = {}
+        for item_id, item_info in items.items():
+            try:
+                migrated[item_id] = {
+                    "description" : item_info["description"],
+                    "do_date" : migrate_date(item_info["do_date"], date(INVALID_YEAR, 1, 1)),
+                    "due_date" : migrate_date(item_info["due_date"], date(INVALID_YEAR, 1, 1)),
+                    "recurrence" : recurrence_translations.get(item_info["recurrence"], "None"),
+                    "delay_to_date" : migrate_date(item_info.get("delay_to_date"), date.today()),
+                    "hide_before_relevant" : item_info.get("hide_before_relevant", False),
+                    "sublist" : SaveSchema.migrate_v1(item_info["sublist"], recurrence_translations),
+                }
+            except SaveFileError as e:
+                e.path.insert(0, item_id)
+                raise
+            except (KeyError, ValueError, TypeError, AttributeError) as e:
+                raise SaveFileError.from_exception(e, [item_id]) from e
+        return migrated
+
+
+class BinarySave:
+    # Compact alternative to the JSON save file. After a header (magic, format version, compression) the
+    # (optionally compressed) payload holds:
+    #   a string table: number of strings, then each string as its length and UTF-8 bytes
+    #   the base list: number of items, then one record per item
+    # Each record is prefixed with its length in bytes and holds the indices of its ID and description in the
+    # string table, the do, due and delay dates as ordinals, the recurrence code, flags and the number of
+    # subitems, followed by the records of its subitems. Items are read straight into ToDoListItems.
+    MAGIC = b"TDLB"
+    VERSION = 1
+    HEADER = struct.Struct("<4sBB")
+    COUNT = struct.Struct("<I")
+    RECORD = struct.Struct("<IIiiiBBI")     # ID, description, do, due, delay, recurrence, flags, number of subitems
+    FLAG_HIDE_BEFORE_RELEVANT = 1
+
+    COMPRESSION = {"none" : 0, "zlib" : 1, "lzma" : 2}
+
+    @staticmethod
+    def encode(to_do_list: ToDoList, compression: str = None) -> bytes:
+        compression = compression if compression is not None else BINARY_COMPRESSION
+        strings: dict[str, int] = {}
+        records = bytearray()
+
+        def string_index(string: str) -> int:
+            index = strings.get(string)
+            if index is None:
+                index = strings[string] = len(strings)
+            return index
+
+        def encode_items(current: ToDoList) -> None:
+            for item in current.items:
+                start = len(records)
+                records.extend(b"\0"*BinarySave.COUNT.size)    # length, filled in once the subitems are written
+                records.extend(BinarySave.RECORD.pack(
+                    string_index(item.id),
+                    string_index(item.description),
+                    item.own_do_date.toordinal(),
+                    item.own_due_date.toordinal(),
+                    item.delay_to_date.toordinal(),
+                    item.own_recurrence if item.own_recurrence is not None else 0,
+                    BinarySave.FLAG_HIDE_BEFORE_RELEVANT if item.hide_before_relevant else 0,
+                    len(item.sublist.items)
+                ))
+                encode_items(item.sublist)
+                BinarySave.COUNT.pack_into(records, start, len(records) - start - BinarySave.COUNT.size)
+
+        records.extend(BinarySave.COUNT.pack(len(to_do_list.items)))
+        encode_items(to_do_list)
+
+        payload = bytearray(BinarySave.COUNT.pack(len(strings)))
+        for string in strings:
+            encoded = string.encode("utf-8")
+            payload.extend(BinarySave.COUNT.pack(len(encoded)))
+            payload.extend(encoded)
+        payload.extend(records)
+
+        match compression:
+            case "zlib":
+                payload = zlib.compress(payload)
+            case "lzma":
+                payload = lzma.compress(payload)
+        return BinarySave.HEADER.pack(BinarySave.MAGIC, BinarySave.VERSION, BinarySave.COMPRESSION[compression]) + payload
+
+    # raises SaveFileError if the data is not a valid binary save
+    @staticmethod
+    def decode(data: bytes) -> ToDoList:
+        try:
+            magic, version, compression = BinarySave.HEADER.unpack_from(data)
+        except struct.error as e:
+            raise SaveFileError("binary save file is too short") from e
+        if magic != BinarySave.MAGIC:
+            raise SaveFileError("not a binary save file")
+        if version != BinarySave.VERSION:
+            raise SaveFileError(f"binary save file version {version} is not supported (expected {BinarySave.VERSION})")
+
+        payload = memoryview(data)[BinarySave.HEADER.size:]
+        try:
+            if compression == BinarySave.COMPRESSION["zlib"]:
+                payload = memoryview(zlib.decompress(payload))
+            elif compression == BinarySave.COMPRESSION["lzma"]:
+                payload = memoryview(lzma.decompress(payload))
+        except (zlib.error, lzma.LZMAError) as e:
+            raise SaveFileError(f"binary save file could not be decompressed ({e})") from e
+
+        try:
+            (n_strings,) = BinarySave.COUNT.unpack_from(payload, 0)
+            offset = BinarySave.COUNT.size
+            strings = []
+            for _ in range(n_strings):
+                (length,) = BinarySave.COUNT.unpack_from(payload, offset)
+                offset += BinarySave.COUNT.size
+                strings.append(str(payload[offset:offset+length], "utf-8"))
+                offset += length
+
+            (n_items,) = BinarySave.COUNT.unpack_from(payload, offset)
+            offset += BinarySave.COUNT.size
+        except (struct.error, UnicodeDecodeError) as e:
+            raise SaveFileError(f"corrupt string table ({e})") from e
+
+        to_do_list = ToDoList({})
+        offset = BinarySave._decode_items(payload, offset, n_items, strings, to_do_list)
+        if offset != len(payload):
+            raise SaveFileError("unexpected data after the last item")
+        return to_do_list
+
+    @staticmethod
+    def _decode_items(payload: memoryview, offset: int, n_items: int, strings: list[str], to_do_list: ToDoList) -> int:
+        for i in range(n_items):
+            item_id = None
+            try:
+                (length,) = BinarySave.COUNT.unpack_from(payload, offset)
+                end = offset + BinarySave.COUNT.size + length
+                id_index, description_index, do, due, delay, recurrence, flags, n_subitems = \
+                    BinarySave.RECORD.unpack_from(payload, offset + BinarySave.COUNT.size)
+                item_id = strings[id_index]
+                if item_id in to_do_list.ids_in_use:
+                    raise SaveFileError("ID is used twice in this list")
+                if recurrence != 0 and recurrence not in Recurrence.to_key:
+                    raise SaveFileError(f"unknown recurrence code {recurrence}")
+
+                sublist = ToDoList({})
+                offset = BinarySave._decode_items(
+                    payload, offset + BinarySave.COUNT.size + BinarySave.RECORD.size, n_subitems, strings, sublist
+                )
+                if offset != end:
+                    raise SaveFileError("record length does not match its contents")
+
+                to_do_item = ToDoListItem(item_id)
+                to_do_item.populate(
+                    strings[description_index],
+                    date.fromordinal(do),
+                    date.fromordinal(due),
+                    recurrence if recurrence != 0 else None,
+                    date.fromordinal(delay),
+                    bool(flags & BinarySave.FLAG_HIDE_BEFORE_RELEVANT),
+                    sublist
+                )
+            except SaveFileError as e:
+                e.path.insert(0, item_id if item_id is not None else f"#{i+1}")
+                raise
+            except (struct.error, IndexError, ValueError) as e:
+                raise SaveFileError.from_exception(e, [item_id if item_id is not None else f"#{i+1}"]) from e
+
+            to_do_list.append_loaded_item(to_do_item)
+        return offset
+
+
+class ShardedSave:
+    # Alternative save layout for big lists: a small manifest with the order of the base list, and one file per
+    # top-level item holding that item and its whole subtree. The item dicts are the same as in the single file.
+    # Only shards whose contents changed since they were last loaded or saved are rewritten.
+    MANIFEST_FILE = "manifest.json"
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self._saved: dict[str, dict] = {}   # item ID -> save dict as it is on disk
+        self._saved_order: list[str] = []
+        self._saved_version: int = None
+
+    @staticmethod
+    def get_shard_name(id: str) -> str:
+        # IDs can contain anything, so keep the readable part and add a checksum to keep names unique
+        return re.sub(r"[^\w-]", "_", id) + f".{zlib.crc32(id.encode()):08x}.json"
+
+    # returns {"version" : ..., "items" : ...} like a single save file
+    def load(self) -> dict:
+        manifest_path = os.path.join(self.directory, ShardedSave.MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            self._saved, self._saved_order = {}, []
+            return SaveSchema.wrap({})
+
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        ids = manifest["items"]
+
+        with ThreadPoolExecutor() as pool:
+            item_dicts = list(pool.map(self._read_shard, ids))
+
+        save_dict = dict(zip(ids, item_dicts))
+        self._saved = save_dict
+        self._saved_order = ids
+        self._saved_version = manifest.get("version", 1)
+        return {"version" : manifest.get("version", 1), "items" : save_dict}     # manifests from before versioning have none
+
+    def _read_shard(self, id: str) -> dict:
+        with open(os.path.join(self.directory, ShardedSave.get_shard_name(id)), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_json(self, name: str, data) -> None:
+        # write to a temporary file first so an interrupted save never leaves a half-written shard
+        path = os.path.join(self.directory, name)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+        os.replace(path + ".tmp", path)
+
+    def save(self, save_dict: dict) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+
+        changed = False
+        for id, item_dict in save_dict.items():
+            if self._saved.get(id) != item_dict:
+                self._write_json(ShardedSave.get_shard_name(id), item_dict)
+                changed = True
+
+        # also rewritten when only shards changed, so its modification time is that of the last change (see get_save_mtime())
+        order = list(save_dict)
+        if changed or order != self._saved_order or self._saved_version != SAVE_SCHEMA_VERSION:
+            self._write_json(ShardedSave.MANIFEST_FILE, {"version" : SAVE_SCHEMA_VERSION, "items" : order})
+
+        for id in self._saved.keys() - save_dict.keys():
+            os.remove(os.path.join(self.directory, ShardedSave.get_shard_name(id)))
+
+        self._saved = save_dict
+        self._saved_order = order
+        self._saved_version = SAVE_SCHEMA_VERSION
+
+
+class CompletionHistory:
+    # Append-only record of completed items, kept in an SQLite file so the save file does not grow with it.
+    # Dates are stored as ordinals and indexed, so looking up a range or one item's completions stays fast.
+    def __init__(self, path: str) -> None:
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS completions (
+                path TEXT NOT NULL,
+                description TEXT NOT NULL,
+                completed INTEGER NOT NULL,
+                occurrence INTEGER,
+                recurrence INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS completions_by_date ON completions (completed);
+            CREATE INDEX IF NOT EXISTS completions_by_path ON completions (path, completed);
+        """)
+
+    def close(self) -> None:
+        self._connection.close()
+
+    # each completion is (item path e.g. '3.2', description, completion date, occurrence date or None, recurrence)
+    def record(self, completions: list[tuple[str, str, date, date, int]]) -> None:
+        if not completions:
+            return
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO completions VALUES (?, ?, ?, ?, ?)",
+                [
+                    (path, description, completed.toordinal(), occurrence.toordinal() if occurrence is not None else None, recurrence)
+                    for path, description, completed, occurrence, recurrence in completions
+                ]
+            )
+
+    # completions between start and end (inclusive) as (path, description, completion date, occurrence date or None)
+    def get_range(self, start: date, end: date) -> list[tuple[str, str, date, date]]:
+        rows = self._connection.execute(
+            "SELECT path, description, completed, occurrence FROM completions WHERE completed BETWEEN ? AND ? ORDER BY completed, rowid",
+            (start.toordinal(), end.toordinal())
+        )
+        return [
+            (path, description, date.fromordinal(completed), date.fromordinal(occurrence) if occurrence is not None else None)
+            for path, description, completed, occurrence in rows
+        ]
+
+    # A streak is a run of completions no further apart than the item's recurrence (a day for other items).
+    # The current streak only counts if the last completion is recent enough to still be continued.
+    # IDs are reused once an item is removed, so an item's completions are the ones with its path and description.
+    def get_stats(self, path: str, description: str) -> dict:
+        rows = self._connection.execute(
+            "SELECT DISTINCT completed, recurrence FROM completions WHERE path = ? AND description = ? ORDER BY completed",
+            (path, description)
+        ).fetchall()
+        if not rows:
+            return {"count" : 0}
+
+        days = [completed for completed, _ in rows]
+        max_gap = {Recurrence.DAILY : 1, Recurrence.WEEKLY : 7, Recurrence.MONTHLY : 31}.get(rows[-1][1], 1)
+
+        longest_streak = streak = 1
+        for previous, current in zip(days, days[1:]):
+            streak = streak + 1 if current - previous <= max_gap else 1
+            longest_streak = max(longest_streak, streak)
+        current_streak = streak if date.today().toordinal() - days[-1] <= max_gap else 0
+
+        count = self._connection.execute(
+            "SELECT COUNT(*) FROM completions WHERE path = ? AND description = ?", (path, description)
+        ).fetchone()[0]
+        weeks = max((date.today().toordinal() - days[0] + 1) / 7, 1)
+        return {
+            "count" : count,
+            "first" : date.fromordinal(days[0]),
+            "last" : date.fromordinal(days[-1]),
+            "current_streak" : current_streak,
+            "longest_streak" : longest_streak,
+            "per_week" : count / weeks,
+        }
+
+
+class SaveLock:
+    # Advisory lock on SAVE_LOCK_FILE so the interactive list and a server (or two of either) can share a save
+    # file: whoever holds it can reload the list if it was changed, change it and save it without the other
+    # program writing in between. Where fcntl is not available this does nothing.
+    def __init__(self, path: str = None) -> None:
+        self.path = path if path is not None else SAVE_LOCK_FILE
+        self._file = None
+
+    def acquire(self) -> None:
+        if fcntl is None:
+            return
+        self._file = open(self.path, "a")
+        fcntl.flock(self._file, fcntl.LOCK_EX)
+
+    def release(self) -> None:
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *args):
+        self.release()
 
 
 class ToDoListManager:
@@ -662,6 +1467,17 @@ class ToDoListManager:
         self._stack: list[ToDoListItem] = []
         self._show_all = False
 
+        self._viewport = VIEWPORT_MODE
+        self._page = 0
+        self._goto_id: str = None
+
+        self.autosave = True    # whether the bulk operations save straight away
+        self._layout = SAVE_LAYOUT
+        self._shards: ShardedSave = ShardedSave(TO_DO_ITEMS_SAVE_DIR) if SAVE_LAYOUT == "sharded" else None
+        self._save_mtime: int = None    # of the save file when it was last read or written here
+        self._undo_list: ToDoList = None    # the list an item was last removed from, see undo_remove_item()
+        self.history = CompletionHistory(HISTORY_FILE)
+
         self.populate()
 
     @property
@@ -670,60 +1486,453 @@ class ToDoListManager:
             return self._stack[-1].sublist
         return self._base
 
+    # raises SaveFileError if the save file cannot be read
     def populate(self) -> None:
-        with open(TO_DO_ITEMS_SAVE_FILE, 'r') as f:
-            save_dict = json.load(f)
-        
+        self._save_mtime = get_save_mtime(self._layout)
+        self._undo_list = None
+        if self._layout == "binary":
+            with open(TO_DO_ITEMS_BINARY_FILE, 'rb') as f:
+                self._base = BinarySave.decode(f.read())
+            return
+
+        try:
+            if self._shards is not None:
+                data = self._shards.load()
+            else:
+                with open(TO_DO_ITEMS_SAVE_FILE, 'r') as f:
+                    data = json.load(f)
+        except ValueError as e:
+            raise SaveFileError(f"not valid JSON ({e})") from e
+
+        save_dict, migrated = SaveSchema.load(data)
         self._base = ToDoList(save_dict)
+        if migrated:
+            self.save()     # so it only has to be migrated once
 
     def save(self) -> None:
-        save_dict = self._base.get_save_dict()
-        with open(TO_DO_ITEMS_SAVE_FILE, 'w') as f:
-            json.dump(save_dict, f, ensure_ascii=False, indent=4)
+        self.write_save_data(self.get_save_data())
+
+    # what write_save_data() needs: the encoded file for the binary layout, otherwise the save dict
+    def get_save_data(self) -> dict | bytes:
+        if self._layout == "binary":
+            return BinarySave.encode(self._base)
+        return self._base.get_save_dict()
+
+    def write_save_data(self, save_data: dict | bytes) -> None:
+        if self._layout == "binary":
+            with open(TO_DO_ITEMS_BINARY_FILE + ".tmp", 'wb') as f:
+                f.write(save_data)
+            os.replace(TO_DO_ITEMS_BINARY_FILE + ".tmp", TO_DO_ITEMS_BINARY_FILE)
+        elif self._shards is not None:
+            self._shards.save(save_data)
+        else:
+            with open(TO_DO_ITEMS_SAVE_FILE + ".tmp", 'w') as f:
+                json.dump(SaveSchema.wrap(save_data), f, ensure_ascii=False, indent=4)
+            os.replace(TO_DO_ITEMS_SAVE_FILE + ".tmp", TO_DO_ITEMS_SAVE_FILE)   # so it is never read half written
+        self._save_mtime = get_save_mtime(self._layout)
+        ReminderDaemon.notify_changed()
+
+    # Another program (e.g. 'todolist.py --serve' while the list is open) may have saved the list since it was
+    # read or written here. Hold a SaveLock around checking, reloading and saving.
+    def has_external_changes(self) -> bool:
+        return get_save_mtime(self._layout) != self._save_mtime
+
+    # reloads the list if it was changed by another program, staying in the same sublist if it still exists
+    def reload_if_changed(self) -> bool:
+        if not self.has_external_changes():
+            return False
+
+        stack_ids = [item.id for item in self._stack]
+        self.populate()
+        self._stack = []
+        for id in stack_ids:
+            item = self.top.find_item(id)
+            if item is None:
+                break
+            self._stack.append(item)
+        return True
+
+    # saves the list in another layout (see SAVE_LAYOUTS) and keeps using that one
+    def save_as(self, layout: str) -> None:
+        self._layout = layout
+        self._shards = ShardedSave(TO_DO_ITEMS_SAVE_DIR) if layout == "sharded" else None
+        self.save()
+
+
+    # Bulk operations for driving the to-do list without input(). They act on the current list, or on the
+    # sublist at path (a list of IDs from the base list) if given. Ancestors are rolled up and the list is
+    # saved once per call rather than once per item.
+
+    def add_many(self, items: list[dict], path: list[str] = None) -> list[str]:
+        to_do_list, ancestors = self.get_list(path)
+        return self._commit(to_do_list.add_many(items), ancestors)
+
+    def update_many(self, updates: dict[str, dict], path: list[str] = None) -> list[str]:
+        to_do_list, ancestors = self.get_list(path)
+        return self._commit(to_do_list.update_many(updates), ancestors)
+
+    def complete_many(self, ids: list[str], path: list[str] = None) -> list[str]:
+        to_do_list, ancestors = self.get_list(path)
+        last_removed = to_do_list.last_removed
+        completed_ids = to_do_list.complete_many(ids)
+        self._track_removal(to_do_list, last_removed)
+        self._record_completions(to_do_list, [ancestor.id for ancestor in ancestors])
+        return self._commit(completed_ids, ancestors)
+
+    def _record_completions(self, to_do_list: ToDoList, list_path: list[str]) -> None:
+        self.history.record([
+            (".".join(list_path + [item.id]), item.description, date.today(), occurrence, item.own_recurrence)
+            for item, occurrence in to_do_list.last_completed
+        ])
+
+    # Subtree operations: these act on an item and everything below it in one pass. Inherited data is rolled
+    # up, lists are sorted and the result is saved once per call, not once per item.
+
+    @staticmethod
+    def _get_subtree_lists(item: ToDoListItem, item_path: list[str]) -> list[tuple[ToDoList, list[str]]]:
+        # the item's sublist and every list below it with their paths, deeper lists before the lists above them
+        lists = []
+        to_visit = [(item.sublist, item_path)]
+        while to_visit:
+            to_do_list, path = to_visit.pop()
+            lists.append((to_do_list, path))
+            to_visit.extend((subitem.sublist, path + [subitem.id]) for subitem in to_do_list.items if subitem.sublist.items)
+        lists.reverse()
+        return lists
+
+    def complete_subtree(self, id: str, path: list[str] = None) -> list[str]:
+        to_do_list, ancestors = self.get_list(path)
+        item = to_do_list.get_item(id)
+        if item is None:
+            return []
+
+        list_path = [ancestor.id for ancestor in ancestors]
+        for sublist, sublist_path in ToDoListManager._get_subtree_lists(item, list_path + [item.id]):
+            if sublist.items:
+                sublist.complete_many([subitem.id for subitem in sublist.items])
+                self._record_completions(sublist, sublist_path)
+
+        # the subitems were completed first so the item itself is rolled up once, here
+        last_removed = to_do_list.last_removed
+        completed_ids = to_do_list.complete_many([item.id])
+        self._track_removal(to_do_list, last_removed)
+        self._record_completions(to_do_list, list_path)
+        return self._commit(completed_ids, ancestors)
+
+    def delay_subtree(self, id: str, n_days: int, path: list[str] = None) -> list[str]:
+        to_do_list, ancestors = self.get_list(path)
+        item = to_do_list.get_item(id)
+        if item is None:
+            return []
+
+        delay_to_date = date.today() + timedelta(days=n_days)
+        item.delay_to(delay_to_date)
+        for sublist, _ in ToDoListManager._get_subtree_lists(item, []):
+            for subitem in sublist.items:
+                subitem.delay_to(delay_to_date)
+        return self._commit([item.id], ancestors)
+
+    def hide_subtree(self, id: str, path: list[str] = None) -> list[str]:
+        to_do_list, ancestors = self.get_list(path)
+        item = to_do_list.get_item(id)
+        if item is None:
+            return []
+
+        item.set_fields({"hide_before_relevant" : True}, update_inherited_data=False)
+        for sublist, _ in ToDoListManager._get_subtree_lists(item, []):
+            for subitem in sublist.items:
+                subitem.set_fields({"hide_before_relevant" : True}, update_inherited_data=False)
+        return self._commit([item.id], ancestors)
+
+    # moves an item with its sublist to the list at dest_path (IDs from the base list, [] for the base list),
+    # returns its new ID which differs from the old one if that was already in use at the destination
+    def move_item(self, id: str, dest_path: list[str], path: list[str] = None) -> str:
+        to_do_list, ancestors = self.get_list(path)
+        item = to_do_list.get_item(id)
+        if item is None:
+            return None
+
+        try:
+            dest_list, dest_ancestors = self.get_list(dest_path)
+        except KeyError as e:
+            to_do_list.log(e.args[0])
+            return None
+        if any(dest_ancestor is item for dest_ancestor in dest_ancestors):
+            to_do_list.log("An item cannot be moved into its own sublist.")
+            return None
+        if dest_list is to_do_list:
+            return item.id
+
+        old_id = item.id
+        to_do_list.take_item(item)
+        dest_list.insert_item(item)     # with a new ID if its ID is taken in the destination list
+        self._commit([item.id], ancestors, dest_ancestors)
+        if item.id != old_id:
+            to_do_list.log(f"ID {old_id} is in use there, so the item was moved as {'.'.join(dest_path + [item.id])}.")
+        return item.id
+
+    def delay_many(self, ids: list[str], n_days: int, path: list[str] = None) -> list[str]:
+        to_do_list, ancestors = self.get_list(path)
+        return self._commit(to_do_list.delay_many(ids, n_days), ancestors)
+
+    # 'finish': recurring items are removed, other items are completed (and recorded in the history) as by 'done'
+    def finish_item(self, id: str, path: list[str] = None) -> list[str]:
+        to_do_list, _ = self.get_list(path)
+        item = to_do_list.get_item(id)
+        if item is None:
+            return []
+        if item.own_recurrence is not None:
+            return self.remove_many([item.id], path)
+        return self.complete_many([item.id], path)
+
+    def undelay_many(self, ids: list[str], path: list[str] = None) -> list[str]:
+        to_do_list, ancestors = self.get_list(path)
+        found = to_do_list._get_items(ids)
+        for item in found.values():
+            item.undelay()
+        return self._commit(list(found), ancestors)
+
+    # prompts for the fields of an item like ToDoList.edit_item()
+    def edit_item(self, id: str, path: list[str] = None) -> list[str]:
+        to_do_list, ancestors = self.get_list(path)
+        item = to_do_list.get_item(id)
+        if item is None:
+            return []
+        return self._commit(to_do_list.update_many({item.id: ToDoListItem.prompt_fields()}), ancestors)
+
+    def remove_many(self, ids: list[str], path: list[str] = None) -> list[str]:
+        to_do_list, ancestors = self.get_list(path)
+        last_removed = to_do_list.last_removed
+        removed_ids = to_do_list.remove_many(ids)
+        self._track_removal(to_do_list, last_removed)
+        return self._commit(removed_ids, ancestors)
+
+    # Items can be removed from any list with dotted paths (see locate()), so 'undo' has to know which list the
+    # last removal was from rather than using the current list.
+    def _track_removal(self, to_do_list: ToDoList, last_removed: ToDoListItem) -> None:
+        if to_do_list.last_removed is not last_removed:
+            self._undo_list = to_do_list
+
+    def undo_remove_item(self) -> None:
+        to_do_list = self._undo_list if self._undo_list is not None else self.top
+        if to_do_list.last_removed is None:
+            return
+        item = to_do_list.last_removed
+        old_id = item.id
+        to_do_list.undo_remove_item()
+        self._undo_list = None
+        if item.id != old_id:
+            self.top.log(f"ID {old_id} is in use now, so the item was restored as {item.id}.")
+
+        ancestors = []
+        owner_item = to_do_list.owner_item
+        while owner_item is not None:
+            ancestors.insert(0, owner_item)
+            owner_item = owner_item._owner.owner_item if owner_item._owner is not None else None
+        self._commit([item.id], ancestors)
+
+    # returns the list at path and the items leading to it, raises KeyError if the path does not exist
+    def get_list(self, path: list[str] = None) -> tuple[ToDoList, list[ToDoListItem]]:
+        if path is None:
+            return self.top, self._stack
+
+        to_do_list = self._base
+        ancestors = []
+        for id in path:
+            item = to_do_list.find_item(id)
+            if item is None:
+                raise KeyError(f"Item does not exist: {'.'.join(path)}")
+            ancestors.append(item)
+            to_do_list = item.sublist
+        return to_do_list, ancestors
+
+    # Commands take either an ID in the current list or a dotted path from the base list, e.g. 'done 3.2.1'.
+    # This returns the path of the list the item is in (None for the current list) and its ID there, so the
+    # item can be changed without going to its list. Each step of the path is a dictionary lookup.
+    def locate(self, ref: str) -> tuple[list[str], str]:
+        if "." in ref and self.top.find_item(ref) is None:
+            path = ref.split(".")
+            try:
+                self.get_list(path[:-1])
+                return path[:-1], path[-1]
+            except KeyError:
+                pass
+        return None, ref    # looked up in the current list, which logs that it does not exist if need be
+
+    # shows messages logged by the list at path (see locate()) with the current list's
+    def forward_log(self, path: list[str]) -> None:
+        to_do_list, _ = self.get_list(path)
+        if to_do_list is not self.top and to_do_list.log_string is not None:
+            self.top.log(to_do_list.log_string)
+            to_do_list.log_string = None
+
+    def _commit(self, changed_ids: list[str], *ancestor_chains: list[ToDoListItem]) -> list[str]:
+        if changed_ids:
+            ToDoListManager._roll_up(*ancestor_chains)
+            if self.autosave:
+                self.save()
+        return changed_ids
 
+    @staticmethod
+    def _roll_up(*ancestor_chains: list[ToDoListItem]) -> None:
+        # update the inherited data of the items on the given paths from the base list, deepest first and each once
+        items = {}
+        for ancestors in ancestor_chains:
+            for depth, item in enumerate(ancestors):
+                items[id(item)] = (depth, item)
+        for _, item in sorted(items.values(), key=lambda x: x[0], reverse=True):
+            item.update_inherited_data()
 
     def push_sublist(self, id: str) -> None:
         item = self.top.get_item(id)
         if item is not None:
             self._stack.append(item)
+            self._page = 0
 
     def pop_sublist(self) -> None:
         if len(self._stack) > 0:
             self._stack.pop(-1)
         self.top.sort()     # in case inherited dates changed
+        self._page = 0
 
     def go_home(self) -> None:
         self._stack = []
+        self._page = 0
 
     def show_all_once(self) -> None:
         self._show_all = True
 
+    def log_summary(self) -> None:
+        labels = {
+            "total" : "Items",
+            "overdue" : "Overdue",
+            "today" : "Today",
+            "hidden" : "Hidden",
+            "delayed" : "Delayed",
+            "recurring" : "Recurring",
+        }
+        columns = [("All lists", self._base.get_aggregates())]
+        if self._stack:
+            columns.insert(0, ("This list", self.top.get_aggregates()))
+
+        summary = "".ljust(12) + "".join(name.rjust(12) for name, _ in columns)
+        for key, label in labels.items():
+            summary += "\n" + label.ljust(12) + "".join(str(aggregates[key]).rjust(12) for _, aggregates in columns)
+        self.top.log(summary)
+
+    # 'history', 'history [n]' for the last n days, 'history [date]' or 'history [from] [to]'
+    def log_history(self, args: list[str]) -> None:
+        end = date.today()
+        if not args:
+            start = end - timedelta(days=6)
+        elif len(args) == 1 and args[0].isdigit():
+            start = end - timedelta(days=int(args[0])-1)
+        else:
+            try:
+                start = DateHandler.get_past_date_from_string(args[0])
+                end = DateHandler.get_past_date_from_string(args[1]) if len(args) > 1 else start
+            except ValueError:
+                start = end = date(INVALID_YEAR, 1, 1)
+            if start.year == INVALID_YEAR or end.year == INVALID_YEAR:
+                self.top.log("Please enter a valid date.")
+                return
+
+        completions = self.history.get_range(start, end)
+        if not completions:
+            self.top.log(f"Nothing completed from {start.strftime(DATE_FORMAT)} to {end.strftime(DATE_FORMAT)}.")
+            return
+
+        lines = []
+        for path, description, completed, occurrence in completions:
+            line = f"{completed.strftime(DATE_FORMAT)}   {path.ljust(COLUMN_LENGTHS[0])}   {description}"
+            if occurrence is not None and occurrence != completed:
+                line += f" ({occurrence.strftime(DATE_FORMAT)})"
+            lines.append(line)
+        self.top.log("\n".join(lines))
+
+    def log_item_stats(self, id: str, path: list[str] = None) -> None:
+        to_do_list, ancestors = self.get_list(path)
+        item = to_do_list.get_item(id)
+        if item is None:
+            return
+
+        stats = self.history.get_stats(".".join([ancestor.id for ancestor in ancestors] + [item.id]), item.description)
+        if stats["count"] == 0:
+            to_do_list.log(f"'{item.description}' has not been completed yet.")
+            return
+
+        to_do_list.log(
+            f"'{item.description}' completed {stats['count']} times since {stats['first'].strftime(SAVE_FILE_DATE_FORMAT)}, "
+            f"last on {stats['last'].strftime(DATE_FORMAT)}\n"
+            f"Current streak: {stats['current_streak']}, longest streak: {stats['longest_streak']}, "
+            f"{stats['per_week']:.1f} times a week"
+        )
+
+    def toggle_viewport(self) -> None:
+        self._viewport = not self._viewport
+        self._page = 0
+
+    def go_to_page(self, page: int) -> None:
+        # pages are numbered from 1 for the user, out of range pages are clamped in print()
+        self._viewport = True
+        self._page = max(page-1, 0)
+
+    def next_page(self) -> None:
+        self._page += 1
+
+    def prev_page(self) -> None:
+        self._page = max(self._page-1, 0)
+
+    def go_to_item(self, id: str) -> None:
+        # the page can only be determined once the terminal size and header are known, so this is resolved in print()
+        item = self.top.get_item(id)
+        if item is not None:
+            self._viewport = True
+            self._goto_id = item.id     # id can also be a description
+
+    @staticmethod
+    def _get_page_starts(items: list[ToDoListItem], generation: int, num_lines: int) -> list[int]:
+        # indices into items at which each page starts, using only the cached line counts (nothing is rendered)
+        page_starts = [0]
+        lines_used = 0
+        for i, to_do_item in enumerate(items):
+            item_lines = to_do_item.get_num_lines(generation)
+            if lines_used > 0 and lines_used + item_lines > num_lines:
+                page_starts.append(i)
+                lines_used = 0
+            lines_used += item_lines
+        return page_starts
+
     def print(self) -> None:
-        print(
-            TextFormatting.columnize(
+        header = TextFormatting.columnize(
                 [Communication["ID"], Communication["Description: "], Communication["Do date:     "], Communication["Due date:     "], Communication["Recurrence:  "]],
                 COLUMN_LENGTHS, PADDING
                 ).strip()
-        )
+        print(header)
+        lines_used = header.count("\n") + 1
 
         width = sum(COLUMN_LENGTHS)+PADDING*(len(COLUMN_LENGTHS)-1)
         print("-"*width)    # Vertical line over all columns
+        lines_used += 1
 
         
+        for parent_item in reversed(self._stack):
+            parent_item.update_inherited_data()     # so changes made in the sublist reach the aggregates of the lists above
+
         generation = 0
         for parent_item in self._stack:
-            print(parent_item.to_string(generation, True))
+            parent_string = parent_item.to_string(generation, True)
+            print(parent_string)
+            lines_used += parent_string.count("\n") + 1
             generation += 1
         
-        tasks_today = False
-        for to_do_item in self.top.items:
-            if to_do_item.do_date <= date.today() or to_do_item.due_date <= date.today():
-                tasks_today = True
-                break
+        tasks_today = self.top.get_aggregates()["today_or_before"] > 0
 
         print("")   # newline
+        lines_used += 1
         if not tasks_today:
             print(TextFormatting.columnize(["","NONE TODAY", "", "", ""], COLUMN_LENGTHS, PADDING, justify="center"))
+            lines_used += 2
 
         hidden_items = 0
 
@@ -733,30 +1942,478 @@ class ToDoListManager:
 
         self.top.sort()
 
-        for to_do_item in self.top.items:
+        shown_items = []
+        hidden_flags = ItemStatus(self.top.items).get_flags()["hidden"]
+        for to_do_item, hidden in zip(self.top.items, hidden_flags):
 
             delay_item = to_do_item.delay_to_date > date.today()
             #if delay_item and not self._show_all:
             #    hidden_items += 1
             
             if self._show_all or NEVER_HIDE:
-                print(to_do_item.to_string(generation))
-            elif not to_do_item.get_hidden():
-                print(to_do_item.to_string(generation))
+                shown_items.append(to_do_item)
+            elif not hidden:
+                shown_items.append(to_do_item)
             else:
                 hidden_items += 1
 
+        page_string = None
+        if self._viewport:
+            lines_used += 1     # page indicator
+            if SHOW_N_HIDDEN and hidden_items != 0:
+                lines_used += 2
+            if self.top.log_string is not None:
+                lines_used += self.top.log_string.count("\n") + 1
+            lines_used += 1     # prompt
+
+            page_starts = self._get_page_starts(shown_items, generation, shutil.get_terminal_size().lines - lines_used)
+
+            if self._goto_id is not None:
+                for i, to_do_item in enumerate(shown_items):
+                    if to_do_item.id == self._goto_id:
+                        self._page = max(n for n, start in enumerate(page_starts) if start <= i)
+                        break
+                else:
+                    self.top.log("Item is hidden, use 'show' to see all items.")
+                self._goto_id = None
+
+            self._page = min(self._page, len(page_starts)-1)
+            page_end = page_starts[self._page+1] if self._page+1 < len(page_starts) else len(shown_items)
+            shown_items = shown_items[page_starts[self._page]:page_end]
+            page_string = f"Page {self._page+1}/{len(page_starts)}"
+
+        for to_do_item in shown_items:
+            print(to_do_item.to_string(generation))
+
         if SHOW_N_HIDDEN and hidden_items != 0:
             print(f"({hidden_items} {Communication['hidden']}) \n".rjust(width))
 
+        if page_string is not None:
+            print(page_string.rjust(width))
+
         self._show_all = False
         self.top.print_log()
 
 
+class ToDoListServer:
+    # Serves one in-memory ToDoListManager over JSON-RPC 2.0 (one JSON object per line), see todolist_client.py.
+    # Reads are answered straight away, writes are serialized and saved together after SERVER_SAVE_DELAY.
+    def __init__(self, manager: ToDoListManager) -> None:
+        self.manager = manager
+        self.manager.autosave = False
+
+        self._write_lock = asyncio.Lock()
+        self._save_task: asyncio.Task = None
+        self._file_lock = SaveLock()    # held from the first write of a batch until it is saved
+
+        self._read_methods = {
+            "list" : self.rpc_list,
+            "get" : self.rpc_get,
+            "agenda" : self.rpc_agenda,
+        }
+        self._write_methods = {
+            "add" : self.rpc_add,
+            "done" : self.rpc_done,
+            "delay" : self.rpc_delay,
+        }
+
+    @staticmethod
+    def parse_address(address: str) -> tuple[str, int] | str:
+        host, _, port = address.rpartition(":")
+        if host and port.isdigit():
+            return host, int(port)
+        return address
+
+    def run(self, address: str = None) -> None:
+        try:
+            asyncio.run(self.serve(address if address is not None else SERVER_ADDRESS))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            # only writes that are still waiting for _save_later() need saving, the SaveLock is held for them
+            if self._save_task is not None:
+                try:
+                    if self.manager.has_external_changes():     # only possible without fcntl
+                        print("The list was changed by another program, the last changes from clients were not saved.")
+                    else:
+                        self.manager.save()
+                finally:
+                    self._file_lock.release()
+
+    async def serve(self, address: str) -> None:
+        address = ToDoListServer.parse_address(address)
+        if isinstance(address, tuple):
+            server = await asyncio.start_server(self.handle_connection, *address)
+        else:
+            if os.path.exists(address):
+                os.remove(address)
+            server = await asyncio.start_unix_server(self.handle_connection, address)
+
+        print("Serving on", address)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if not isinstance(address, tuple) and os.path.exists(address):
+                os.remove(address)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                if line.strip() == b"":
+                    continue
+                response = await self.handle_request(line)
+                writer.write(json.dumps(response, ensure_ascii=False).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, line: bytes) -> dict:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return ToDoListServer._error(None, -32700, "Parse error")
+        if not isinstance(request, dict):
+            return ToDoListServer._error(None, -32600, "Invalid Request")
+
+        request_id = request.get("id")
+        method = request.get("method")
+        params = request.get("params", {})
+        if not isinstance(params, dict):
+            return ToDoListServer._error(request_id, -32602, "params must be an object")
+
+        try:
+            if method in self._read_methods:
+                if self._save_task is None and self.manager.has_external_changes():
+                    async with self._write_lock:
+                        await self._reload_if_changed()
+                result = self._read_methods[method](**params)
+            elif method in self._write_methods:
+                async with self._write_lock:
+                    if self._save_task is None:     # first write of a batch, see _save_later()
+                        await asyncio.get_running_loop().run_in_executor(None, self._file_lock.acquire)
+                        try:
+                            self.manager.reload_if_changed()
+                        except BaseException:
+                            self._file_lock.release()   # no save is scheduled that would release it
+                            raise
+                        self._schedule_save()
+                    result = self._write_methods[method](**params)
+            else:
+                return ToDoListServer._error(request_id, -32601, "Method not found")
+        except (TypeError, ValueError, KeyError, AttributeError) as e:     # mostly params of the wrong type
+            return ToDoListServer._error(request_id, -32602, str(e))
+        except Exception as e:
+            return ToDoListServer._error(request_id, -32603, f"Internal error: {e}")
+
+        return {"jsonrpc" : "2.0", "id" : request_id, "result" : result}
+
+    @staticmethod
+    def _error(request_id, code: int, message: str) -> dict:
+        return {"jsonrpc" : "2.0", "id" : request_id, "error" : {"code" : code, "message" : message}}
+
+    def _schedule_save(self) -> None:
+        if self._save_task is None:
+            self._save_task = asyncio.create_task(self._save_later())
+
+    async def _reload_if_changed(self) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._file_lock.acquire)
+        try:
+            self.manager.reload_if_changed()
+        finally:
+            self._file_lock.release()
+
+    # Writes are saved together, and the SaveLock is held from the first of them until they are saved so no
+    # other program saves in between. Writes that arrive while saving wait for it and start the next batch.
+    async def _save_later(self) -> None:
+        await asyncio.sleep(SERVER_SAVE_DELAY)
+        async with self._write_lock:
+            self._save_task = None
+            try:
+                save_data = self.manager.get_save_data()
+                await asyncio.get_running_loop().run_in_executor(None, self.manager.write_save_data, save_data)
+            finally:
+                self._file_lock.release()
+
+    @staticmethod
+    def _item_to_dict(item: ToDoListItem, path: list[str]) -> dict:
+        def date_to_str(d: date):
+            return d.isoformat() if d.year != INVALID_YEAR else None
+
+        return {
+            "id" : item.id,
+            "path" : path,
+            "description" : item.description,
+            "do_date" : date_to_str(item.do_date),
+            "due_date" : date_to_str(item.due_date),
+            "recurrence" : Recurrence.to_text(item.recurrence) if item.recurrence is not None else None,
+            "delay_to_date" : item.delay_to_date.isoformat(),
+            "hidden" : item.get_hidden(),
+            "subitems" : len(item.sublist.items),
+        }
+
+    def _write(self, method, *args, path: list[str]) -> dict:
+        to_do_list, _ = self.manager.get_list(path)
+        ids = method(*args, path=path)
+        messages = to_do_list.log_string.split("\n") if to_do_list.log_string is not None else []
+        to_do_list.log_string = None
+        return {"ids" : ids, "messages" : messages}
+
+    def rpc_list(self, path: list[str] = None) -> list[dict]:
+        path = path or []
+        to_do_list, _ = self.manager.get_list(path)
+        return [ToDoListServer._item_to_dict(item, path + [item.id]) for item in to_do_list.items]
+
+    def rpc_get(self, path: list[str]) -> dict:
+        if not path:
+            raise ValueError("path must not be empty")
+        _, ancestors = self.manager.get_list(path)
+        item = ancestors[-1]
+        path = [ancestor.id for ancestor in ancestors]
+        out = ToDoListServer._item_to_dict(item, path)
+        out["sublist"] = [ToDoListServer._item_to_dict(subitem, path + [subitem.id]) for subitem in item.sublist.items]
+        return out
+
+    # items with their own do or due date within the next n days, across the whole tree
+    def rpc_agenda(self, days: int = 0) -> list[dict]:
+        last_day = date.today() + timedelta(days=int(days))
+        agenda = []
+        to_visit = [(self.manager._base, [])]
+        while to_visit:
+            to_do_list, path = to_visit.pop()
+            for item in to_do_list.items:
+                item_path = path + [item.id]
+                if min(item.own_do_date, item.own_due_date) <= last_day and item.delay_to_date <= date.today():
+                    agenda.append((min(item.own_do_date, item.own_due_date), item, item_path))
+                if item.sublist.items:
+                    to_visit.append((item.sublist, item_path))
+
+        agenda.sort(key=lambda x: x[0])
+        return [ToDoListServer._item_to_dict(item, item_path) for _, item, item_path in agenda]
+
+    def rpc_add(self, items: list[dict], path: list[str] = None) -> dict:
+        return self._write(self.manager.add_many, items, path=path or [])
+
+    def rpc_done(self, ids: list[str], path: list[str] = None) -> dict:
+        return self._write(self.manager.complete_many, ids, path=path or [])
+
+    def rpc_delay(self, ids: list[str], n_days: int, path: list[str] = None) -> dict:
+        return self._write(self.manager.delay_many, ids, int(n_days), path=path or [])
+
+
+class SystemClock:
+    # ReminderDaemon only gets the time and waits through this, so tests can give it a fake clock instead
+    def now(self) -> datetime:
+        return datetime.now()
+
+    # waits until something can be read from the socket (returns True, once it has all been read) or timeout
+    # seconds have passed (returns False), None waits forever
+    def wait(self, timeout: float, wakeup: socket.socket) -> bool:
+        readable, _, _ = select.select([wakeup], [], [], timeout)
+        if not readable:
+            return False
+        try:
+            while wakeup.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+
+class ReminderDaemon:
+    # Reminds about do dates, due dates, the end of delays and hidden items becoming relevant (see
+    # ToDoListItem.get_hidden()). Upcoming events are kept in a heap and the daemon sleeps until the first one,
+    # so it does nothing while idle. Whoever saves the list sends it SIGUSR1 (see notify_changed()), which wakes
+    # it through signal.set_wakeup_fd() (the signal handler itself does nothing, so it cannot deadlock); it then
+    # reloads the list and only replaces the events of items that changed. Events of changed or removed items
+    # are left in the heap and skipped when they come up, using a generation number per item.
+    def __init__(self, clock: SystemClock = None, remind=None) -> None:
+        self.clock = clock if clock is not None else SystemClock()
+        self.remind = remind if remind is not None else ReminderDaemon.default_remind     # called with each message
+
+        self._heap: list[tuple[datetime, int, str, int, str]] = []     # (when, tie breaker, item path, generation, message)
+        self._counter = itertools.count()
+        self._items: dict[str, tuple[int, frozenset]] = {}      # item path -> (generation, its events)
+        self._wakeup, self._wakeup_sender = socket.socketpair()     # written to when a signal arrives, see run()
+        self._wakeup.setblocking(False)
+        self._wakeup_sender.setblocking(False)
+        self._save_mtime: int = None
+
+    # PID of the running daemon, None if there is none. The daemon keeps its PID file locked, so a file left
+    # behind by a daemon that was killed is not trusted: its PID may belong to another process by now.
+    @staticmethod
+    def get_running_pid() -> int:
+        if fcntl is None:
+            return None
+        try:
+            with open(REMINDER_PID_FILE, "r") as f:
+                try:
+                    fcntl.flock(f, fcntl.LOCK_SH | fcntl.LOCK_NB)
+                    return None     # not locked, so not held by a daemon
+                except BlockingIOError:
+                    return int(f.read())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    @staticmethod
+    def notify_changed() -> None:
+        if not hasattr(signal, "SIGUSR1"):
+            return
+        pid = ReminderDaemon.get_running_pid()
+        if pid is None:
+            return
+        try:
+            os.kill(pid, signal.SIGUSR1)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    @staticmethod
+    def default_remind(message: str) -> None:
+        if REMINDER_COMMAND:
+            subprocess.run(shlex.split(REMINDER_COMMAND) + [message])
+        else:
+            print(datetime.now().strftime("%H:%M"), message, flush=True)
+
+    @staticmethod
+    def get_events(item: ToDoListItem, today: date) -> frozenset[tuple[date, str]]:
+        events = set()
+        if item.own_do_date.year != INVALID_YEAR:
+            events.add((item.own_do_date, f"Do today: {item.description}"))
+        if item.own_due_date.year != INVALID_YEAR:
+            events.add((item.own_due_date, f"Due today: {item.description}"))
+        if item.delay_to_date > today:
+            events.add((item.delay_to_date, f"Showing again: {item.description}"))
+
+        # the day get_hidden() stops hiding the item, if it is hidden before it is relevant
+        may_hide = HIDE_RECURRING_ITEMS_BEFORE_RELEVANT if item.recurrence is not None else item.hide_before_relevant
+        if may_hide and not NEVER_HIDE:
+            relevant_dates = []
+            if item.do_date.year != INVALID_YEAR:
+                relevant_dates.append(item.do_date - timedelta(days=2))
+            if item.due_date.year != INVALID_YEAR:
+                relevant_dates.append(item.due_date - timedelta(days=3))
+            if relevant_dates and today < min(relevant_dates):
+                events.add((min(relevant_dates), f"Coming up: {item.description}"))
+        return frozenset(events)
+
+    def update(self, base: ToDoList) -> None:
+        now = self.clock.now()
+        reminder_time = datetime.strptime(REMINDER_TIME, "%H:%M").time()
+
+        new_items = {}
+        to_visit = [(base, [])]
+        while to_visit:
+            to_do_list, path = to_visit.pop()
+            for item in to_do_list.items:
+                item_path = path + [item.id]
+                new_items[".".join(item_path)] = ReminderDaemon.get_events(item, now.date())
+                if item.sublist.items:
+                    to_visit.append((item.sublist, item_path))
+
+        for path in self._items.keys() - new_items.keys():
+            del self._items[path]       # its events in the heap are skipped from now on
+
+        for path, events in new_items.items():
+            generation, old_events = self._items.get(path, (0, None))
+            if events == old_events:
+                continue
+            generation += 1
+            self._items[path] = (generation, events)
+            for event_date, message in events:
+                when = datetime.combine(event_date, reminder_time)
+                if when > now:
+                    heapq.heappush(self._heap, (when, next(self._counter), path, generation, f"{path}  {message}"))
+
+        # do not let skipped events pile up
+        if len(self._heap) > 2*sum(len(events) for _, events in self._items.values()) + 64:
+            self._heap = [event for event in self._heap if self._is_current(event)]
+            heapq.heapify(self._heap)
+
+    def _is_current(self, event: tuple) -> bool:
+        _, _, path, generation, _ = event
+        return path in self._items and self._items[path][0] == generation
+
+    def reload(self) -> None:
+        try:
+            with SaveLock():    # so a save that is still being written is not read
+                manager = ToDoListManager()
+        except SaveFileError as e:
+            print(f"Could not read {get_save_path()}: {e}", flush=True)
+            return
+        manager.history.close()
+        self._save_mtime = get_save_mtime()
+        self.update(manager._base)
+
+    # sends the reminders that are due and returns when the next one is, if there is one
+    def remind_due(self) -> datetime:
+        now = self.clock.now()
+        while self._heap:
+            event = self._heap[0]
+            if not self._is_current(event):
+                heapq.heappop(self._heap)
+            elif event[0] <= now:
+                heapq.heappop(self._heap)
+                self.remind(event[4])
+            else:
+                return event[0]
+        return None
+
+    # one round: remind about anything due, then sleep until the next event or until the list changes
+    def step(self) -> None:
+        next_event = self.remind_due()
+        timeout = max((next_event - self.clock.now()).total_seconds(), 0) if next_event is not None else None
+        if not hasattr(signal, "SIGUSR1"):
+            timeout = REMINDER_POLL_INTERVAL if timeout is None else min(timeout, REMINDER_POLL_INTERVAL)
+
+        if self.clock.wait(timeout, self._wakeup):
+            self.reload()
+        elif not hasattr(signal, "SIGUSR1") and get_save_mtime() != self._save_mtime:
+            self.reload()
+
+    def run(self) -> None:
+        if ReminderDaemon.get_running_pid() is not None:
+            print("A reminder is already running.")
+            return
+
+        # the handler has to be in place before anyone can find the PID file, SIGUSR1 would end the process otherwise
+        signal.set_wakeup_fd(self._wakeup_sender.fileno())
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, lambda signum, frame: None)
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit())     # so the PID file is removed
+
+        # locked for as long as the daemon runs (see get_running_pid()), and only put in place once it is locked
+        # and has the PID in it
+        pid_file = open(REMINDER_PID_FILE + ".tmp", "w")
+        if fcntl is not None:
+            fcntl.flock(pid_file, fcntl.LOCK_EX)
+        pid_file.write(str(os.getpid()))
+        pid_file.flush()
+        os.replace(REMINDER_PID_FILE + ".tmp", REMINDER_PID_FILE)
+
+        try:
+            self.reload()
+            print("Waiting for reminders, press Ctrl+C to stop.", flush=True)
+            while True:
+                self.step()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(REMINDER_PID_FILE)
+            pid_file.close()
+
+
 def run_to_do_list():
     global Communication
 
-    to_do_list = ToDoListManager()
+    try:
+        to_do_list = ToDoListManager()
+    except SaveFileError as e:
+        print(f"Could not read {get_save_path()}: {e}")
+        return
+    to_do_list.autosave = False     # saved after every command below
 
     quit = False
     while not quit:
@@ -765,12 +2422,20 @@ def run_to_do_list():
         print("> ", end="")
         command = input()
 
+        # e.g. a plugin using 'todolist.py --serve' changed the list, the IDs on screen may be out of date
+        with SaveLock():
+            reloaded = to_do_list.reload_if_changed()
+        if reloaded and command.strip() not in ("", "q", "quit", "exit"):
+            to_do_list.top.log(f"The list was changed by another program, so it was reloaded instead of running '{command}'.")
+            continue
+
         if command == "q" or command == "quit" or command == "exit":
             quit = True
         elif command == "":
             continue
 
         command_args = command.split()
+        path = None     # set by commands that were given a dotted path, see ToDoListManager.locate()
 
         if command_args[0][:3] == "add" and command_args[0] != "add": # custom ID
             id = command_args[0][3:]
@@ -792,9 +2457,21 @@ def run_to_do_list():
                     else:
                         to_do_list.top.add_item(desc=command[4:])
                 case "done":
-                    to_do_list.top.done_item(command_args[1])
+                    if command_args[1] == "-r":
+                        path, id = to_do_list.locate(command_args[2])
+                        to_do_list.complete_subtree(id, path)
+                    else:
+                        path, id = to_do_list.locate(command_args[1])
+                        to_do_list.complete_many([id], path)
+                case "move" | "mv":
+                    if len(command_args) < 3:
+                        to_do_list.top.log("'move [ID]' must be followed by the path of a list, e.g. 3.2 or home.")
+                    else:
+                        path, id = to_do_list.locate(command_args[1])
+                        dest_path = [] if command_args[2] in ("home", "/") else command_args[2].split(".")
+                        to_do_list.move_item(id, dest_path, path)
                 case "undo":
-                    to_do_list.top.undo_remove_item()
+                    to_do_list.undo_remove_item()
                 case "sub" | "s":
                     if len(command_args) == 1:
                         to_do_list.pop_sublist()
@@ -803,11 +2480,16 @@ def run_to_do_list():
                 case "home":
                     to_do_list.go_home()
                 case "del" | "remove" | "rm":
-                    to_do_list.top.remove_item(command_args[1])
+                    path, id = to_do_list.locate(command_args[1])
+                    to_do_list.remove_many([id], path)
                 case "edit":
-                    to_do_list.top.edit_item(command_args[1])
+                    path, id = to_do_list.locate(command_args[1])
+                    to_do_list.edit_item(id, path)
                 case "hide":
-                    if len(command_args) > 2:
+                    if command_args[1] == "-r":
+                        path, id = to_do_list.locate(command_args[2])
+                        to_do_list.hide_subtree(id, path)
+                    elif len(command_args) > 2:
                         if command_args[2] == "until":
                             try:
                                 until_date = DateHandler.get_date_from_string(command_args[3])
@@ -815,40 +2497,73 @@ def run_to_do_list():
                                     to_do_list.top.log("Please enter a valid date.")
                                 else:
                                     days_until = (until_date - date.today()).days
-                                    to_do_list.top.delay_item(command_args[1], days_until)
+                                    path, id = to_do_list.locate(command_args[1])
+                                    to_do_list.delay_many([id], days_until, path)
                             except IndexError:
                                 to_do_list.top.log("'hide [ID] until' must be followed by a date.")
                         else:
                             to_do_list.top.log("Invalid command.")
                     else:
-                        to_do_list.top.hide_item(command_args[1])
+                        path, id = to_do_list.locate(command_args[1])
+                        to_do_list.update_many({id : {"hide_before_relevant" : True}}, path)
                 case "unhide":
-                    if to_do_list.top.get_item(command_args[1]).hide_before_relevant == False and \
-                                to_do_list.top.get_item(command_args[1]).delay_to_date != date.today():
-                            to_do_list.top.undelay_item(command_args[1])
+                    path, id = to_do_list.locate(command_args[1])
+                    item = to_do_list.get_list(path)[0].get_item(id)
+                    if item is None:
+                        pass
+                    elif item.hide_before_relevant == False and item.delay_to_date != date.today():
+                        to_do_list.undelay_many([id], path)
                     else:
-                        to_do_list.top.unhide_item(command_args[1])
+                        to_do_list.update_many({id : {"hide_before_relevant" : False}}, path)
                 case "finish":
-                    to_do_list.top.finish_recurring_item(command_args[1])
+                    path, id = to_do_list.locate(command_args[1])
+                    to_do_list.finish_item(id, path)
                 case "revert":
                     to_do_list.top.revert_recurring_item(command_args[1])
                 case "show" | "reveal":
                     to_do_list.show_all_once()
+                case "summary":
+                    to_do_list.log_summary()
+                case "history":
+                    to_do_list.log_history(command_args[1:])
+                case "stats":
+                    path, id = to_do_list.locate(command_args[1])
+                    to_do_list.log_item_stats(id, path)
+                case "page":
+                    if len(command_args) == 1:
+                        to_do_list.toggle_viewport()
+                    else:
+                        try:
+                            to_do_list.go_to_page(int(command_args[1]))
+                        except ValueError:
+                            to_do_list.top.log("Page number must be an integer!")
+                case "next":
+                    to_do_list.next_page()
+                case "prev":
+                    to_do_list.prev_page()
+                case "goto":
+                    to_do_list.go_to_item(command_args[1])
                 case "delay":
                     try:
-                        to_do_list.top.delay_item(command_args[1], int(command_args[2]))
+                        if command_args[1] == "-r":
+                            path, id = to_do_list.locate(command_args[2])
+                            to_do_list.delay_subtree(id, int(command_args[3]), path)
+                        else:
+                            path, id = to_do_list.locate(command_args[1])
+                            to_do_list.delay_many([id], int(command_args[2]), path)
                     except ValueError:
                         to_do_list.top.log("Number of days to delay must be an integer!")   # TODO: add this string to language json
                     except IndexError:
                         to_do_list.top.log("Please add a number of days to delay the item to the command.") # TODO: add this string to language json
                 case "undelay":
-                    to_do_list.top.undelay_item(command_args[1])
+                    path, id = to_do_list.locate(command_args[1])
+                    to_do_list.undelay_many([id], path)
                 case "help":
                     to_do_list.top.log(HELP_STRING)
                 case "delall":
                     print(Communication["Are you sure? This cannot be undone. "] + "[y/N]")
                     if input().lower() == "y":
-                        to_do_list.top.remove_all_items()
+                        to_do_list.remove_many([to_do_item.id for to_do_item in to_do_list.top.items])
                 case "lang":
                     try:
                         with open(LANG_FILE, "r", encoding="utf-8") as lang_file:
@@ -882,47 +2597,93 @@ def run_to_do_list():
                 case "restore_backup":
                     print("Are you sure? Changes from this session will be lost. [y/N]")
                     if input().lower() == 'y':
+                        save_path = get_save_path()
                         backup_files = sorted(
-                            [os.path.join(BACKUP_DIR, f) for f in os.listdir(BACKUP_DIR) if f.startswith(TO_DO_ITEMS_SAVE_FILE)],
+                            [os.path.join(BACKUP_DIR, f) for f in os.listdir(BACKUP_DIR) if f.startswith(save_path + ".")],
                             key=lambda f: os.stat(f).st_mtime, reverse=True)
 
                         # Restore most recent backup, if it exists
                         if backup_files:
-                            shutil.copy(backup_files[0], TO_DO_ITEMS_SAVE_FILE)
-                            to_do_list.populate()
-                            print(f"Restored {TO_DO_ITEMS_SAVE_FILE} from backup: {backup_files[0]}")
+                            copy_save(backup_files[0], save_path)
+                            try:
+                                to_do_list.populate()
+                                print(f"Restored {save_path} from backup: {backup_files[0]}")
+                            except SaveFileError as e:
+                                print(f"Could not read backup {backup_files[0]}, keeping the current list: {e}")
                         else:
-                            print("No backups found for", TO_DO_ITEMS_SAVE_FILE)
+                            print("No backups found for", save_path)
 
-        to_do_list.save()
+        if path is not None:
+            to_do_list.forward_log(path)
+        with SaveLock():
+            if to_do_list.reload_if_changed():  # while the command waited for input
+                to_do_list.top.log("The list was changed by another program while the command ran, so it was reloaded and the command was not saved.")
+            else:
+                to_do_list.save()
+
+def get_save_path(layout: str = None) -> str:
+    match layout if layout is not None else SAVE_LAYOUT:
+        case "sharded":
+            return TO_DO_ITEMS_SAVE_DIR
+        case "binary":
+            return TO_DO_ITEMS_BINARY_FILE
+    return TO_DO_ITEMS_SAVE_FILE
+
+# modification time of the save file in nanoseconds (of the manifest for the sharded layout), None if there is none
+def get_save_mtime(layout: str = None) -> int:
+    layout = layout if layout is not None else SAVE_LAYOUT
+    path = get_save_path(layout)
+    if layout == "sharded":
+        path = os.path.join(path, ShardedSave.MANIFEST_FILE)
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
 
-if __name__ == '__main__':
-    # create save file (with {} for json loading) if it doesn't exist
-    with open(TO_DO_ITEMS_SAVE_FILE, "a+") as f:
-        f.seek(0)
-        in_f = f.read()
-        assert type(in_f) == str
-        if in_f.strip() == "":
-            f.write("{}")
+# copies a save file or a sharded save directory
+def copy_save(source: str, destination: str) -> None:
+    if os.path.isdir(source):
+        if os.path.exists(destination):
+            shutil.rmtree(destination)
+        shutil.copytree(source, destination)
+    else:
+        shutil.copy(source, destination)
 
-    # Create backups folder if it doesn't exist
-    if not os.path.exists(BACKUP_DIR):
-        os.makedirs(BACKUP_DIR)
+# writes the list in another layout and switches to it, the old save is left as it is
+def convert_save_layout(layout: str) -> None:
+    global SAVE_LAYOUT
 
-    # Get list of existing backup files, sorted by modification time (oldest first)
-    backup_files = sorted(
-        [os.path.join(BACKUP_DIR, f) for f in os.listdir(BACKUP_DIR) if f.startswith(TO_DO_ITEMS_SAVE_FILE)],
-        key=lambda f: os.stat(f).st_mtime)
+    if layout not in SAVE_LAYOUTS:
+        print("Layout must be one of:", *SAVE_LAYOUTS)
+        return
 
-    # Remove oldest backups if there are more than MAX_BACKUPS
-    while len(backup_files) >= MAX_BACKUPS:
-        os.remove(backup_files.pop(0))
+    if layout == SAVE_LAYOUT:
+        print(f"Already using the '{layout}' layout.")
+        return
 
-    # Create a new backup file
-    backup_filename = backup_filename = os.path.join(BACKUP_DIR, f"{TO_DO_ITEMS_SAVE_FILE}.{int(time.time())}.bak")
-    shutil.copy(TO_DO_ITEMS_SAVE_FILE, backup_filename)
+    try:
+        manager = ToDoListManager()
+    except SaveFileError as e:
+        print(f"Could not read {get_save_path()}: {e}")
+        return
+    manager.history.close()
+    manager.save_as(layout)
+    SAVE_LAYOUT = layout
+
+    try:
+        with open(SETTINGS_FILE, "r", encoding="utf-8") as settings_file:
+            settings = json.load(settings_file)
+    except FileNotFoundError:
+        settings = {}   # the layout has to be remembered or the next start would read the old save
+
+    settings["save_layout"] = layout
 
+    with open(SETTINGS_FILE, "w", encoding="utf-8") as settings_file:
+        json.dump(settings, settings_file, ensure_ascii=False, indent=4)
 
+    print(f"Saved {len(manager._base.items)} items to {get_save_path()}")
+
+if __name__ == '__main__':
     # load settings
     try:
         with open(SETTINGS_FILE, "r", encoding="utf-8") as settings_file:
@@ -936,8 +2697,20 @@ if __name__ == '__main__':
                 HIDE_RECURRING_ITEMS_BEFORE_RELEVANT = settings["hide_recurring_items_before_relevant"]
             except KeyError:
                 pass
+
+            # read one by one so that settings files from before these were added still work
+            VIEWPORT_MODE = settings.get("viewport_mode", VIEWPORT_MODE)
+            SAVE_LAYOUT = settings.get("save_layout", SAVE_LAYOUT)
+            BINARY_COMPRESSION = settings.get("binary_compression", BINARY_COMPRESSION)
+            REMINDER_TIME = settings.get("reminder_time", REMINDER_TIME)
+            REMINDER_COMMAND = settings.get("reminder_command", REMINDER_COMMAND)
+            SERVER_ADDRESS = settings.get("server_address", SERVER_ADDRESS)
     except FileNotFoundError:
         pass
+
+    if BINARY_COMPRESSION not in BinarySave.COMPRESSION:
+        print(f"Unknown binary_compression '{BINARY_COMPRESSION}' in the settings, saving without compression.")
+        BINARY_COMPRESSION = "none"
     
     try:
         with open(LANG_FILE, "r", encoding="utf-8") as lang_file:
@@ -946,4 +2719,54 @@ if __name__ == '__main__':
     except FileNotFoundError:
         pass
 
-    run_to_do_list()
+    if SAVE_LAYOUT == "sharded":
+        os.makedirs(TO_DO_ITEMS_SAVE_DIR, exist_ok=True)
+    elif SAVE_LAYOUT == "binary":
+        if not os.path.exists(TO_DO_ITEMS_BINARY_FILE):
+            with open(TO_DO_ITEMS_BINARY_FILE, "wb") as f:
+                f.write(BinarySave.encode(ToDoList({})))
+    else:
+        # create an empty save file if it doesn't exist
+        with open(TO_DO_ITEMS_SAVE_FILE, "a+") as f:
+            f.seek(0)
+            in_f = f.read()
+            assert type(in_f) == str
+            if in_f.strip() == "":
+                f.write(json.dumps(SaveSchema.wrap({})))
+
+    # Create backups folder if it doesn't exist
+    if not os.path.exists(BACKUP_DIR):
+        os.makedirs(BACKUP_DIR)
+
+    save_path = get_save_path()
+
+    # Get list of existing backup files, sorted by modification time (oldest first)
+    backup_files = sorted(
+        [os.path.join(BACKUP_DIR, f) for f in os.listdir(BACKUP_DIR) if f.startswith(save_path + ".")],
+        key=lambda f: os.stat(f).st_mtime)
+
+    # Remove oldest backups if there are more than MAX_BACKUPS
+    while len(backup_files) >= MAX_BACKUPS:
+        backup_file = backup_files.pop(0)
+        if os.path.isdir(backup_file):
+            shutil.rmtree(backup_file)
+        else:
+            os.remove(backup_file)
+
+    # Create a new backup file
+    backup_filename = backup_filename = os.path.join(BACKUP_DIR, f"{save_path}.{int(time.time())}.bak")
+    copy_save(save_path, backup_filename)
+
+    if "--convert" in sys.argv:
+        layout_index = sys.argv.index("--convert") + 1
+        convert_save_layout(sys.argv[layout_index] if layout_index < len(sys.argv) else "")
+    elif "--remind" in sys.argv:
+        ReminderDaemon().run()
+    elif "--serve" in sys.argv:
+        address_index = sys.argv.index("--serve") + 1
+        try:
+            ToDoListServer(ToDoListManager()).run(sys.argv[address_index] if address_index < len(sys.argv) else None)
+        except SaveFileError as e:
+            print(f"Could not read {get_save_path()}: {e}")
+    else:
+        run_to_do_list()
@@ -0,0 +1,95 @@
+import contextlib
+import io
+import json
+import os
+import random
+import tempfile
+from datetime import date, timedelta
+
+import todolist
+from todolist_loadtest import build_save_dict
+
+# Checks of things that are easy to break without noticing, run in a temporary directory.
+#
+# Usage: python todolist_check.py
+
+@contextlib.contextmanager
+def count_calls(cls, name: str):
+    # counts the calls of cls.name in the list it gives, while in the with block
+    calls = [0]
+    method = getattr(cls, name)
+    def wrapper(*args, **kwargs):
+        calls[0] += 1
+        return method(*args, **kwargs)
+    setattr(cls, name, wrapper)
+    try:
+        yield calls
+    finally:
+        setattr(cls, name, method)
+
+def check_viewport_formats_only_visible_rows() -> None:
+    manager = todolist.ToDoListManager()
+    manager.toggle_viewport()
+    os.environ["LINES"] = "40"
+
+    output = io.StringIO()
+    with count_calls(todolist.ToDoListItem, "get_columns") as calls, contextlib.redirect_stdout(output):
+        manager.print()
+        calls[0] = 0
+        output.seek(0)
+        output.truncate(0)
+        manager.print()
+
+    num_visible = output.getvalue().count("item ")
+    assert 0 < num_visible < len(manager.top.items), num_visible
+    assert calls[0] == num_visible, f"second print() formatted {calls[0]} rows to show {num_visible}"
+    manager.history.close()
+
+def check_item_status_paths_agree() -> None:
+    # the hidden flags have to match ToDoListItem.get_hidden(), and the NumPy path the plain Python one
+    random.seed(1)
+    today = date.today()
+    def random_date() -> str:
+        if random.random() < 0.2:
+            return None
+        return (today + timedelta(days=random.randint(-10, 10))).strftime(todolist.SAVE_FILE_DATE_FORMAT)
+
+    to_do_list = todolist.ToDoList({})
+    to_do_list.add_many([{
+        "description" : str(i),
+        "do_date" : random_date(),
+        "due_date" : random_date(),
+        "recurrence" : random.choice([None, "weekly", "monthly", "daily"]),
+        "hide_before_relevant" : random.random() < 0.5,
+        "delay_to_date" : today + timedelta(days=random.randint(-2, 3)),
+    } for i in range(500)])
+
+    hide_recurring = todolist.HIDE_RECURRING_ITEMS_BEFORE_RELEVANT
+    for todolist.HIDE_RECURRING_ITEMS_BEFORE_RELEVANT in (True, False):
+        np, todolist.np = todolist.np, None
+        python_status = todolist.ItemStatus(to_do_list.items)
+        todolist.np = np
+        assert python_status.get_flags()["hidden"] == [item.get_hidden() for item in to_do_list.items]
+
+        if todolist.np is None:
+            continue
+        numpy_status = todolist.ItemStatus(to_do_list.items)
+        assert numpy_status.vectorized
+        for day in range(-12, 13):
+            numpy_flags = numpy_status.get_flags(today + timedelta(days=day))
+            python_flags = python_status.get_flags(today + timedelta(days=day))
+            assert numpy_flags == python_flags, f"NumPy and plain Python flags differ {day} days from today"
+    todolist.HIDE_RECURRING_ITEMS_BEFORE_RELEVANT = hide_recurring
+
+    if todolist.np is None:
+        print("NumPy is not installed, so only the plain Python path was checked")
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        with open(todolist.TO_DO_ITEMS_SAVE_FILE, "w") as f:
+            json.dump(build_save_dict(300, 3), f)
+
+        for check in [check_viewport_formats_only_visible_rows, check_item_status_paths_agree]:
+            check()
+            print("ok", check.__name__)
@@ -0,0 +1,114 @@
+import json
+import socket
+import sys
+
+from todolist import SERVER_ADDRESS, SETTINGS_FILE, ToDoListServer
+
+# Small client for a to-do list started with 'todolist.py --serve'.
+# Paths are lists of IDs from the base list, e.g. ["3", "2"] for item 2 in the sublist of item 3.
+# Dates can be given in any format the to-do list understands and are returned in ISO format (or None).
+#
+# Usage from the command line:
+#   python todolist_client.py agenda [days]
+#   python todolist_client.py list [path]           path as dotted IDs, e.g. 3.2
+#   python todolist_client.py get [path]
+#   python todolist_client.py add [description]
+#   python todolist_client.py done [path]
+#   python todolist_client.py delay [path] [n]
+# The server is reached at 'server_address' from todolist_settings.json like 'todolist.py --serve' uses, or at
+# the address given with --address [address] before the command.
+
+def get_server_address() -> str:
+    try:
+        with open(SETTINGS_FILE, "r", encoding="utf-8") as settings_file:
+            return json.load(settings_file).get("server_address", SERVER_ADDRESS)
+    except FileNotFoundError:
+        return SERVER_ADDRESS
+
+class ToDoListClient:
+    def __init__(self, address: str = None) -> None:
+        address = ToDoListServer.parse_address(address if address is not None else get_server_address())
+        if isinstance(address, tuple):
+            self._socket = socket.create_connection(address)
+        else:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.connect(address)
+        self._file = self._socket.makefile("rb")
+        self._next_id = 1
+
+    def close(self) -> None:
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def call(self, method: str, **params):
+        request = {"jsonrpc" : "2.0", "id" : self._next_id, "method" : method, "params" : params}
+        self._next_id += 1
+        self._socket.sendall(json.dumps(request, ensure_ascii=False).encode() + b"\n")
+
+        response = json.loads(self._file.readline())
+        if "error" in response:
+            raise RuntimeError(f"{method}: {response['error']['message']}")
+        return response["result"]
+
+    def list_items(self, path: list[str] = None) -> list[dict]:
+        return self.call("list", path=path or [])
+
+    def get(self, path: list[str]) -> dict:
+        return self.call("get", path=path)
+
+    def agenda(self, days: int = 0) -> list[dict]:
+        return self.call("agenda", days=days)
+
+    def add(self, items: list[dict], path: list[str] = None) -> dict:
+        return self.call("add", items=items, path=path or [])
+
+    def done(self, ids: list[str], path: list[str] = None) -> dict:
+        return self.call("done", ids=ids, path=path or [])
+
+    def delay(self, ids: list[str], n_days: int, path: list[str] = None) -> dict:
+        return self.call("delay", ids=ids, n_days=n_days, path=path or [])
+
+
+def split_path(path_str: str) -> tuple[list[str], str]:
+    # '3.2' -> (['3'], '2'), i.e. the path of the list and the ID in it
+    path = path_str.split(".")
+    return path[:-1], path[-1]
+
+if __name__ == '__main__':
+    argv = sys.argv[1:]
+    address = None
+    if argv[:1] == ["--address"] and len(argv) >= 2:
+        address, argv = argv[1], argv[2:]
+
+    if len(argv) < 1:
+        print("Usage: todolist_client.py [--address address] agenda|list|get|add|done|delay [arguments]")
+        sys.exit(1)
+
+    command, args = argv[0], argv[1:]
+    with ToDoListClient(address) as client:
+        match command:
+            case "agenda":
+                result = client.agenda(int(args[0]) if args else 0)
+            case "list":
+                result = client.list_items(args[0].split(".") if args else [])
+            case "get":
+                result = client.get(args[0].split("."))
+            case "add":
+                result = client.add([{"description" : " ".join(args)}])
+            case "done":
+                path, id = split_path(args[0])
+                result = client.done([id], path)
+            case "delay":
+                path, id = split_path(args[0])
+                result = client.delay([id], int(args[1]), path)
+            case _:
+                print("Unknown command:", command)
+                sys.exit(1)
+
+    print(json.dumps(result, ensure_ascii=False, indent=4))
@@ -0,0 +1,104 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+import todolist
+
+# Load test for 'todolist.py --serve': builds a large tree in a temporary directory, starts a server on it
+# and reports requests per second for concurrent reads and writes.
+#
+# Usage: python todolist_loadtest.py [top-level items] [subitems per item] [clients] [requests per client]
+
+ADDRESS = "127.0.0.1:8766"
+
+def build_save_dict(n_items: int, n_subitems: int) -> dict:
+    def item(description: str, day: int, sublist: dict) -> dict:
+        return {
+            "description" : description,
+            "do_date" : f"{day % 28 + 1:02d}/{day % 12 + 1:02d}/2030",
+            "due_date" : "01/01/9999",
+            "recurrence" : "weekly" if day % 7 == 0 else "None",
+            "delay_to_date" : "01/01/2000",
+            "hide_before_relevant" : False,
+            "sublist" : sublist,
+        }
+
+    return todolist.SaveSchema.wrap({
+        str(i) : item(f"item {i}", i, {str(j) : item(f"subitem {i}.{j}", i+j, {}) for j in range(1, n_subitems+1)})
+        for i in range(1, n_items+1)
+    })
+
+def run_server(directory: str) -> None:
+    os.chdir(directory)
+    todolist.SERVER_SAVE_DELAY = 0.5
+    todolist.ToDoListServer(todolist.ToDoListManager()).run(ADDRESS)
+
+async def client(n_requests: int, n_items: int, n_subitems: int, write_ratio: float, latencies: list[float]) -> None:
+    host, port = todolist.ToDoListServer.parse_address(ADDRESS)
+    reader, writer = await asyncio.open_connection(host, port)
+    for request_id in range(n_requests):
+        i = str(random.randint(1, n_items))
+        if random.random() < write_ratio:
+            request = {"method" : "delay", "params" : {"ids" : [str(random.randint(1, n_subitems))], "n_days" : 0, "path" : [i]}}
+        else:
+            request = random.choice([
+                {"method" : "get", "params" : {"path" : [i]}},
+                {"method" : "list", "params" : {"path" : [i]}},
+            ])
+        request["jsonrpc"] = "2.0"
+        request["id"] = request_id
+
+        start = time.perf_counter()
+        writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - start)
+        if "error" in response:
+            raise RuntimeError(response["error"])
+    writer.close()
+
+async def run_clients(n_clients: int, n_requests: int, n_items: int, n_subitems: int, write_ratio: float) -> None:
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(n_requests, n_items, n_subitems, write_ratio, latencies) for _ in range(n_clients)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"  {len(latencies)} requests in {elapsed:.2f} s: {len(latencies)/elapsed:.0f} requests/s, "
+          f"median latency {latencies[len(latencies)//2]*1000:.2f} ms, p99 {latencies[int(len(latencies)*0.99)]*1000:.2f} ms")
+
+async def wait_for_server() -> None:
+    host, port = todolist.ToDoListServer.parse_address(ADDRESS)
+    for _ in range(600):
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("Server did not start")
+
+if __name__ == '__main__':
+    n_items, n_subitems, n_clients, n_requests = (list(map(int, sys.argv[1:])) + [2000, 10, 20, 500][len(sys.argv)-1:])[:4]
+
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, todolist.TO_DO_ITEMS_SAVE_FILE), "w") as f:
+            json.dump(build_save_dict(n_items, n_subitems), f)
+        print(f"Tree: {n_items} items with {n_subitems} subitems each, {n_clients} clients x {n_requests} requests")
+
+        server = multiprocessing.Process(target=run_server, args=(directory,))
+        server.start()
+        try:
+            asyncio.run(wait_for_server())
+            print("Reads only:")
+            asyncio.run(run_clients(n_clients, n_requests, n_items, n_subitems, 0.0))
+            print("10% writes:")
+            asyncio.run(run_clients(n_clients, n_requests, n_items, n_subitems, 0.1))
+        finally:
+            server.terminate()
+            server.join()